@@ -1,36 +1,41 @@
 import pygame
-from pygame.sprite import Sprite
  
-class Alien(Sprite):
-    """A class to represent a single alien in the fleet."""
-
-    def __init__(self, ai_game):
-        """Initialize the alien and set its starting position."""
-        super().__init__() # use parent class __init__
-        self.screen = ai_game.screen # Initialize screen
-        self.settings = ai_game.settings # Initialize settings
-
-        # Load the alien image and set its rect attribute.
-        self.image = pygame.image.load('images/alien.bmp') # set image
-        self.rect = self.image.get_rect() # set image coordinates
-
-        # Start each new alien near the top left of the screen.
-        self.rect.x = self.rect.width # Set alien horixontal coordinates
-        self.rect.y = self.rect.height # Set alien vertical coordinates
-
-        # Store the alien's exact horizontal position.
-        self.x = float(self.rect.x)
-
-    def check_edges(self):
-        """Return True if alien is at edge of screen."""
-        screen_rect = self.screen.get_rect() # get screen
-        # check distance from edges
-        if self.rect.right >= screen_rect.right or self.rect.left <= 0:
-            return True # at edge of screen
-
-    def update(self):
-        """Move the alien right or left."""
-        # direction and speed
-        self.x += (self.settings.alien_speed *
-                        self.settings.fleet_direction)
-        self.rect.x = self.x # set direction and speed
+class Alien:
+    """A class to represent a single alien in the fleet.
+
+    The alien's position lives in the fleet's arrays; an Alien is a handle
+    to one slot of them. Handles are reused whenever the fleet is rebuilt.
+    """
+
+    __slots__ = ('fleet', 'index', 'image')
+
+    def __init__(self, fleet, index):
+        """Initialize the alien as a view of slot index of fleet."""
+        self.fleet = fleet # fleet holding the alien's position
+        self.index = index # slot of the alien in the fleet's arrays
+        self.image = fleet.image # shared image
+
+    @property
+    def x(self):
+        """The alien's exact horizontal position."""
+        return float(self.fleet.x[self.index])
+
+    @x.setter
+    def x(self, value):
+        self.fleet.x[self.index] = value
+
+    @property
+    def rect(self):
+        """A rect holding the alien's current position."""
+        rect = pygame.Rect(0, int(self.fleet.y[self.index]),
+            self.fleet.width, self.fleet.height) # alien's size and row
+        rect.x = self.x # rounded like any rect position
+        return rect
+
+    def alive(self):
+        """Return True if the alien has not been killed."""
+        return bool(self.fleet.alive[self.index])
+
+    def kill(self):
+        """Remove the alien from the fleet."""
+        self.fleet.kill(self.index)
@@ -1,125 +1,417 @@
+import argparse
 import sys
-from time import sleep
+from time import perf_counter, sleep
 
 import pygame
 
 from settings import Settings
 from game_stats import GameStats
+from game_state import GameState
+from score_store import ScoreStore
+from telemetry import Telemetry
+from controls import Controls, REDRAW_TYPES
+from replay import InputRecorder, Recording
+from snapshot import save_snapshot, load_snapshot
+from assets import AssetManager
+from fonts import FontCache
+from startup_timer import StartupTimer
 from scoreboard import Scoreboard
 from button import Button
 from ship import Ship
-from bullet import Bullet
-from alien import Alien
+from bullet_group import BulletGroup
+from fleet import Fleet
+from renderer import DirtyRectRenderer
+from frame_stats import FrameStats
 
 
 class AlienInvasion:
     """Overall class to manage game assets and behavior."""
 
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        pygame.init() # initialize all pygame modules
-        self.settings = Settings() # Initialize a settings object for the current game
+    def __init__(self, headless=False, size=None, settings=None):
+        """Initialize the game, and create game resources.
 
-        # Initialize screen for display set_mode(0,0) sets best possible match
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        With headless set no window is opened and nothing is rendered, so the
+        simulation can be stepped on machines without a display. size is the
+        (width, height) of the world; by default the game fills the display,
+        or uses the Settings screen size when headless or scaled. settings
+        replaces the default Settings.
+        """
+        self.startup = StartupTimer() # time each phase until the first frame
+        self.headless = headless # simulate without a display
+        if not headless:
+            # Initialize only the pygame modules the game uses (not audio).
+            pygame.display.init()
+            pygame.font.init()
+        # Initialize a settings object for the current game
+        self.settings = settings or Settings()
+        self.startup.mark("pygame init")
+
+        if headless:
+            self.screen = None # nothing is drawn in headless mode
+            width, height = size or (self.settings.screen_width,
+                self.settings.screen_height) # explicit world size
+        else:
+            if self.settings.scaled:
+                # Draw at a fixed logical size, which SDL scales to the
+                # window or display, so the work per frame doesn't grow
+                # with the monitor.
+                scale = self.settings.render_scale # logical size multiplier
+                size = size or (round(self.settings.screen_width * scale),
+                    round(self.settings.screen_height * scale))
+                self.screen = self._set_mode(size, pygame.SCALED |
+                    (0 if self.settings.windowed else pygame.FULLSCREEN))
+            elif size:
+                # Initialize a window of the requested size.
+                self.screen = self._set_mode(size)
+            else:
+                # Initialize screen for display set_mode(0,0) sets best possible match
+                self.screen = self._set_mode((0, 0), pygame.FULLSCREEN)
+            width, height = self.screen.get_size() # actual screen size
+
+            # set title of display (Screen)
+            pygame.display.set_caption("Alien Invasion")
+        self.startup.mark("display")
+
+        # Rect of the world the game is played in.
+        self.screen_rect = pygame.Rect(0, 0, width, height)
 
         # set screen width based on screen dimensions
-        self.settings.screen_width = self.screen.get_rect().width
+        self.settings.screen_width = width
 
-        # set screen width based on screen dimensions
-        self.settings.screen_height = self.screen.get_rect().height
+        # set screen height based on screen dimensions
+        self.settings.screen_height = height
 
-        # set title of display (Screen)
-        pygame.display.set_caption("Alien Invasion")
+        # Load each image once and share it between sprites.
+        self.assets = AssetManager(self)
+        # Resolve each font once, remembering font files between runs.
+        self.fonts = FontCache(self.settings.font_cache)
 
         # Create a GameStats instance to store game statistics,
         self.stats = GameStats(self)
+
+        # Keep every finished game; headless games are not saved.
+        self.scores = None
+        if not headless and self.settings.score_db:
+            self.scores = ScoreStore(self.settings.score_db)
+            self.stats.high_score = self.scores.high_score() # best game so far
+
+        # Stream gameplay events to disk in the background, if asked to.
+        self.telemetry = None
+        if not headless and self.settings.telemetry_dir:
+            self.telemetry = Telemetry(self.settings.telemetry_dir)
+
         self.sb = Scoreboard(self) # Create a scoreboard.
+        self.startup.mark("scoreboard")
         self.ship = Ship(self) # create a Ship instance
 
         # load alien and ship bitmap images
-        self.bullets = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
+        self.bullets = BulletGroup(self) # bullets in flight, and spent ones to reuse
+        self.aliens = Fleet(self) # alien positions kept in arrays
 
         self._create_fleet() # create a fleet of Instances of alien objects
 
+        self.startup.mark("sprites")
+
         # Make the Play button.
         self.play_button = Button(self, "Play")
+        self.startup.mark("play button")
+
+        # Optionally redraw only the parts of the screen that changed.
+        self.renderer = None # full redraw every frame
+        if self.settings.dirty_rects and not headless:
+            self.renderer = DirtyRectRenderer(self)
+
+        self.recorder = None # input is only recorded on request
+        self.replaying = False # input comes from a recording
+        self.pending_events = [] # input to record with the next tick
+
+        # Time each phase of every frame when asked to; F3 shows the overlay.
+        self.frame_stats = FrameStats(self)
+        if self.settings.frame_stats and not headless:
+            self.frame_stats.start()
+
+        # Keys act through the table in Settings.key_bindings.
+        self.controls = Controls(self, self._key_actions())
+        if not headless: # there is no queue without a display
+            self.controls.filter_events() # only queue the events handled
 
     def run_game(self):
         """Start the main loop for the game."""
+        self._update_screen() # draw the first frame
+        self.startup.mark("first frame")
+        if self.settings.report_startup: # show where startup time went
+            print(self.startup.report(), file=sys.stderr)
+            print(self.assets.report(), file=sys.stderr) # image cache use
+
+        # The simulation advances in fixed ticks of 1 / tick_rate seconds,
+        # however fast frames are drawn, so it runs at the same speed on
+        # every machine.
+        clock = pygame.time.Clock() # holds frames to the fps cap
+        tick = 1 / self.settings.tick_rate # game time each tick stands for
+        lag = 0.0 # real time not simulated yet
         while True:
-            self._check_events() # check for keyboard or mouse presses
+            # Sleep until the next frame is due (fps_cap 0 doesn't sleep).
+            elapsed = clock.tick(self.settings.fps_cap) / 1000
+            if self.stats.game_active:
+                self._check_events() # check for keyboard or mouse presses
+                # After a stall, catch up by at most a quarter of a second.
+                lag += min(elapsed, 0.25)
+            else:
+                # Nothing moves until a game starts, so sleep until input.
+                self._check_events(True)
+                clock.tick() # time spent waiting isn't simulated
+                lag = 0.0
+
+            ticked = lag >= tick # the input handled will show this frame
+            while lag >= tick: # every tick that is due
+                self._tick(tick) # advance the simulation by one tick
+                lag -= tick
+            self._update_screen() # redraw the screen
+            self.controls.frame_shown(ticked) # time the input it shows
+            self.aliens.prepare(self.screen) # get the next fleet ready
 
-            if self.stats.game_active: # confirm game is running
-                self.ship.update() # update ship instance based on user input
-                self._update_bullets() # update bullet/s location based on user input
-                self._update_aliens() # update alien/s location
+    def run_headless(self, script):
+        """Play a new game without a display, one tick per entry of script.
 
-            self._update_screen() # redraw the screen
+        Each entry of script is the sequence of events to handle on that tick,
+        e.g. pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE).
+        Return the number of ticks that were simulated.
+        """
+        self._start_game() # skip the Play button
+        ticks = 0 # number of ticks simulated
+        for events in script: # events scripted for each tick
+            self.step(events) # handle input and advance the simulation
+            ticks += 1
+        return ticks
+
+    @classmethod
+    def from_recording(cls, recording, headless=False):
+        """Return a game built with the settings and size of a Recording."""
+        settings = Settings()
+        recording.apply(settings) # before anything reads them
+        return cls(headless=headless, size=recording.size, settings=settings)
+
+    def run_replay(self, recording, realtime=True):
+        """Play a Recording back through the same code paths as live input.
+
+        The game should come from from_recording, so that every setting is
+        the recorded one.
+
+        Without realtime, or when headless, ticks run as fast as possible.
+        Return True if the game ended with exactly the recorded score,
+        level and ships left.
+        """
+        if self.scores: # replayed games are not saved again
+            self.scores.close()
+            self.scores = None
+        if self.telemetry: # nor logged again
+            self.telemetry.close()
+            self.telemetry = None
+        recording.seed_random() # the RNG as the recorded game had it
+        self.replaying = True
+
+        start = perf_counter() # wall clock time the replay started
+        game_time = 0.0 # recorded time played back so far
+        try:
+            for events, elapsed in recording.ticks: # input of each tick
+                self.step(events, elapsed) # same handlers as a live game
+                if self.headless:
+                    continue # nothing to show
+                pygame.event.pump() # keep the window responsive
+                self._update_screen() # redraw the screen
+                self.aliens.prepare(self.screen) # get the next fleet ready
+                game_time += elapsed
+                if realtime and game_time > perf_counter() - start:
+                    sleep(game_time - (perf_counter() - start)) # keep to recorded pace
+        except SystemExit:
+            pass # the recorded game was quit
+
+        final = (self.stats.score, self.stats.level, self.stats.ships_left)
+        return final == recording.final
+
+    def step(self, events=(), elapsed=None):
+        """Handle the given events, then advance the game by one tick.
+
+        elapsed is the time in seconds the tick stands for, used to time
+        pauses; it defaults to 1 / Settings.tick_rate.
+        """
+        for event in events: # scripted input for this tick
+            self._handle_event(event) # respond as if the event was queued
+
+        if elapsed is None:
+            elapsed = 1 / self.settings.tick_rate # one simulated tick
+        self._advance(elapsed) # advance the simulation by one tick
+
+    def start_recording(self, path, seed=None):
+        """Record the input of every tick from now on to the file at path."""
+        self.recorder = InputRecorder(path, self, seed)
+
+    def _tick(self, elapsed):
+        """Record the input handled since the last tick, then advance."""
+        if self.recorder: # a replay handles that input, then this tick
+            self.recorder.record_tick(self.pending_events, elapsed)
+            self.pending_events = []
+        self._advance(elapsed) # advance the simulation by one tick
+
+    def _advance(self, elapsed):
+        """Run timed transitions, then move everything if playing."""
+        self.stats.state.update(elapsed) # run timed transitions
+
+        if self.stats.state.playing: # confirm game is running
+            self._update_world() # advance the simulation by one tick
+
+    def _update_world(self):
+        """Advance the ship, bullets and fleet by one tick."""
+        self.ship.update() # update ship instance based on user input
+        self._update_bullets() # update bullet/s location based on user input
+        self._update_aliens() # update alien/s location
 
-    def _check_events(self):
-        """Respond to keypresses and mouse events."""
-        for event in pygame.event.get(): # get all messages and remove from the queue
-            if event.type == pygame.QUIT: # reads exit condition
-                sys.exit() # exit game
-            elif event.type == pygame.KEYDOWN: # if a key on keyboard is pressed
-                self._check_keydown_events(event) # respond to keypresses
-            elif event.type == pygame.KEYUP: # check if a key is released
-                self._check_keyup_events(event) # respond to key releases
-            elif event.type == pygame.MOUSEBUTTONDOWN: # check if mouse button is pressed
-                mouse_pos = pygame.mouse.get_pos() # get position of mouse cursor
-                self._check_play_button(mouse_pos)  # respond to mouse button pressed
+    def _check_events(self, wait=False):
+        """Respond to keypresses and mouse events.
+
+        With wait set, block until at least one event arrives.
+        """
+        events = pygame.event.get() # get all messages and remove from the queue
+        if wait and not events:
+            # Sleep without using the CPU until there is input.
+            events = [pygame.event.wait()] + pygame.event.get()
+        self.controls.read(events) # timestamp the input
+        if self.recorder: # keep the input for the next tick's record
+            self.pending_events.extend(events)
+        for event in events:
+            self._handle_event(event) # respond to the event
+
+    def _handle_event(self, event):
+        """Respond to a single keypress, mouse or window event."""
+        if event.type == pygame.QUIT: # reads exit condition
+            self._quit() # exit game
+        elif event.type == pygame.KEYDOWN: # if a key on keyboard is pressed
+            self._check_keydown_events(event) # respond to keypresses
+        elif event.type == pygame.KEYUP: # check if a key is released
+            self._check_keyup_events(event) # respond to key releases
+        elif event.type == pygame.MOUSEBUTTONDOWN: # check if mouse button is pressed
+            # position of mouse cursor when the button was pressed
+            self._check_play_button(event.pos) # respond to mouse button pressed
+        elif event.type in REDRAW_TYPES: # the window was uncovered or resized
+            if self.renderer: # every other frame is drawn in full anyway
+                self.renderer.invalidate() # draw all of the next frame
 
     def _check_play_button(self, mouse_pos):
         """Start a new game when the player clicks Play."""
         # set to true if play button is clicked
         button_clicked = self.play_button.rect.collidepoint(mouse_pos)
         # play button is clicked and another game is not active
-        if button_clicked and not self.stats.game_active: 
-            # Reset the game settings.
-            self.settings.initialize_dynamic_settings()
-            
-            self.stats.reset_stats() # Reset the game statistics.
-            self.stats.game_active = True # set game to active
-            self.sb.prep_score() # Turn the score into a rendered image.
-            self.sb.prep_level() # turn the level into a rendered image
-            self.sb.prep_ships() # show how many ships are left
+        if button_clicked and not self.stats.game_active:
+            self._start_game() # start a new game
 
-            # Get rid of any remaining aliens and bullets.
-            self.aliens.empty() # remove all alien instances from game screen
-            self.bullets.empty() # remove all bullet instances from game screen
-            
-            # Create a new fleet and center the ship.
-            self._create_fleet()  # create a fleet of Instances of alien objects
-            self.ship.center_ship() # Center the ship on the screen
+    def _start_game(self):
+        """Reset the game statistics and settings and start a new game."""
+        # Reset the game settings.
+        self.settings.initialize_dynamic_settings()
+
+        self.stats.reset_stats() # Reset the game statistics.
+        self.stats.game_active = True # set game to active
+        self.sb.prep_score() # Turn the score into a rendered image.
+        self.sb.prep_level() # turn the level into a rendered image
+        self.sb.prep_ships() # show how many ships are left
+
+        # Get rid of any remaining aliens and bullets.
+        self.aliens.empty() # remove all alien instances from game screen
+        self.bullets.empty() # remove all bullet instances from game screen
+
+        # Create a new fleet and center the ship.
+        self._create_fleet()  # create a fleet of Instances of alien objects
+        self.ship.center_ship() # Center the ship on the screen
 
+        if not self.headless: # there is no cursor without a display
             pygame.mouse.set_visible(False) # Hide the mouse cursor.
 
     def _check_keydown_events(self, event):
         """Respond to keypresses."""
-        if event.key == pygame.K_RIGHT: # if right arrow pressed
-            self.ship.moving_right = True # move ship right
-        elif event.key == pygame.K_LEFT: # if left arrow pressed
-            self.ship.moving_left = True # move ship left
-        elif event.key == pygame.K_q: # if q button pressed
-            sys.exit() # exit game
-        elif event.key == pygame.K_SPACE:  # if space button pressed
-            self._fire_bullet() # Create a new bullet and add it to the bullets group.
+        action = self.controls.keydown.get(event.key) # bound to the key
+        if action:
+            action()
 
     def _check_keyup_events(self, event):
         """Respond to key releases."""
-        if event.key == pygame.K_RIGHT: # right arrow released
-            self.ship.moving_right = False # stop moving right
-        elif event.key == pygame.K_LEFT: # left arrow released
-            self.ship.moving_left = False # stop moving left
+        action = self.controls.keyup.get(event.key) # bound to the key
+        if action:
+            action()
+
+    def _key_actions(self):
+        """Return the (pressed, released) handlers of each bindable action."""
+        return {
+            'move_right': (self._move_right, self._stop_right),
+            'move_left': (self._move_left, self._stop_left),
+            'fire': (self._fire_bullet, None),
+            'quit': (self._quit, None),
+            'frame_overlay': (self._toggle_overlay, None),
+            'profile': (self.frame_stats.toggle_profile, None),
+            'save_snapshot': (self._save_snapshot, None),
+            'load_snapshot': (self._load_snapshot, None),
+        }
+
+    def _move_right(self):
+        """Start moving the ship right."""
+        self.ship.moving_right = True
+
+    def _stop_right(self):
+        """Stop moving the ship right."""
+        self.ship.moving_right = False
+
+    def _move_left(self):
+        """Start moving the ship left."""
+        self.ship.moving_left = True
+
+    def _stop_left(self):
+        """Stop moving the ship left."""
+        self.ship.moving_left = False
+
+    def _toggle_overlay(self):
+        """Show or hide frame times, if there is a screen to show them on."""
+        if not self.headless:
+            self.frame_stats.toggle_overlay()
+
+    def _save_snapshot(self):
+        """Save the game to Settings.snapshot_path."""
+        try:
+            save_snapshot(self, self.settings.snapshot_path)
+        except OSError as error:
+            print(f"can't save snapshot: {error}", file=sys.stderr)
+
+    def _load_snapshot(self):
+        """Resume the game saved to Settings.snapshot_path."""
+        if self.recorder or self.replaying:
+            # Recordings only hold input, so they can't follow a load.
+            print("can't load a snapshot while recording or replaying",
+                file=sys.stderr)
+            return
+        try:
+            load_snapshot(self, self.settings.snapshot_path)
+        except (OSError, ValueError) as error:
+            print(f"can't load snapshot: {error}", file=sys.stderr)
+
+    def _quit(self):
+        """Save anything still pending and exit the game."""
+        if self.scores: # finish writing finished games
+            self.scores.close()
+        if self.telemetry: # finish writing gameplay events
+            self.telemetry.close()
+        if self.recorder: # end the recording with the final statistics
+            self.recorder.close()
+        self.frame_stats.close() # export frame times and any profile
+        if self.settings.report_latency: # show how responsive input was
+            print(self.controls.report(), file=sys.stderr)
+        sys.exit() # exit game
 
     def _fire_bullet(self):
         """Create a new bullet and add it to the bullets group."""
         # ensure max number of bullets is not surpassed
         if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self) # Instantiate new bullet
-            self.bullets.add(new_bullet) # Add new bullet to list of bullets
+            self.bullets.fire() # Reuse a spent bullet, or make a new one
+            if self.telemetry:
+                self.telemetry.emit('shot', x=self.ship.rect.centerx,
+                    bullets=len(self.bullets))
 
     def _update_bullets(self):
         """Update position of bullets and get rid of old bullets."""
@@ -127,9 +419,7 @@ class AlienInvasion:
         self.bullets.update()
 
         # Get rid of bullets that have disappeared.
-        for bullet in self.bullets.copy(): # go through all bullets
-            if bullet.rect.bottom <= 0: # if bullet is out of range
-                 self.bullets.remove(bullet) # remove bullet from list of all bullets
+        self.bullets.remove_offscreen() # return them to the pool
 
         self._check_bullet_alien_collisions() # Respond to bullet-alien collisions
 
@@ -137,11 +427,15 @@ class AlienInvasion:
         """Respond to bullet-alien collisions."""
         # Remove any bullets and aliens that have collided.
         # Find all sprites that collide between bullets and aliens (doKill arguments = True).
-        collisions = pygame.sprite.groupcollide(self.bullets, self.aliens, True, True)
+        collisions = self.aliens.collide(self.bullets)
 
         if collisions: # if collision occurs
             for aliens in collisions.values(): # go through each alien that collided in aliens list
                 self.stats.score += self.settings.alien_points * len(aliens) # increase score
+                if self.telemetry:
+                    self.telemetry.emit('kill', aliens=len(aliens),
+                        points=self.settings.alien_points * len(aliens),
+                        score=self.stats.score)
             self.sb.prep_score() # Turn the score into a rendered image.
             self.sb.check_high_score() # Check to see if there's a new high score
 
@@ -153,6 +447,16 @@ class AlienInvasion:
 
             self.stats.level += 1 # Increase level.
             self.sb.prep_level()  # turn the level into a rendered image
+            if self.telemetry: # with the speeds the new level runs at
+                self.telemetry.emit('level', level=self.stats.level,
+                    ship_speed=self.settings.ship_speed,
+                    bullet_speed=self.settings.bullet_speed,
+                    alien_speed=self.settings.alien_speed,
+                    alien_points=self.settings.alien_points)
+
+            # Pause briefly before the new level starts.
+            self.stats.state.set(GameState.LEVEL_TRANSITION,
+                self.settings.level_pause)
 
     def _update_aliens(self):
         """
@@ -163,24 +467,25 @@ class AlienInvasion:
         self.aliens.update() # update alien positions
 
         # Look for alien-ship collisions.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
+        if self.aliens.collide_any(self.ship.rect, self.ship.mask):
             self._ship_hit() # Respond to the ship being hit by an alien
 
-        # Look for aliens hitting the bottom of the screen.
-        self._check_aliens_bottom() # Check if any aliens have reached the bottom of the screen.
+        # Look for aliens hitting the bottom of the screen, unless the
+        # collision just ended the game.
+        if self.stats.game_active:
+            self._check_aliens_bottom() # Check if any aliens have reached the bottom of the screen.
 
     def _check_aliens_bottom(self):
         """Check if any aliens have reached the bottom of the screen."""
-        screen_rect = self.screen.get_rect() # reference to screen
-        # for each alien bitmap image
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= screen_rect.bottom: # if alien is out of bounds
-                # Treat this the same as if the ship got hit.
-                self._ship_hit() # Respond to the ship being hit by an alien
-                break # exit loop
+        if self.aliens.check_bottom(): # if the lowest alien is out of bounds
+            # Treat this the same as if the ship got hit.
+            self._ship_hit() # Respond to the ship being hit by an alien
 
     def _ship_hit(self):
         """Respond to the ship being hit by an alien."""
+        if self.telemetry:
+            self.telemetry.emit('death', ships_left=self.stats.ships_left,
+                score=self.stats.score, level=self.stats.level)
         # livews are still remaining
         if self.stats.ships_left > 0:
             # Decrement ships_left, and update scoreboard.
@@ -195,18 +500,22 @@ class AlienInvasion:
             self._create_fleet() # create a fleet of Instances of alien objects
             self.ship.center_ship() # Center the ship on the screen
             
-            # Pause.
-            sleep(0.5) # sleep for half a second
+            # Pause, while events and rendering carry on.
+            self.stats.state.set(GameState.RESPAWN_PAUSE,
+                self.settings.respawn_pause)
         else: # no lives remaining
             self.stats.game_active = False # set game inactive
-            pygame.mouse.set_visible(True) # set mouse pointer to visible
+            if self.scores: # save the finished game in the background
+                self.scores.record(self.stats.score, self.stats.level,
+                    self.settings)
+            if not self.headless: # there is no cursor without a display
+                pygame.mouse.set_visible(True) # set mouse pointer to visible
 
     def _create_fleet(self):
         """Create the fleet of aliens."""
-        # Create an alien and find the number of aliens in a row.
+        # Find the number of aliens in a row.
         # Spacing between each alien is equal to one alien width.
-        alien = Alien(self) # Instantiate alien 
-        alien_width, alien_height = alien.rect.size # Set alien size
+        alien_width, alien_height = self.aliens.width, self.aliens.height # Set alien size
         # space to left and right of aliens
         available_space_x = self.settings.screen_width - (2 * alien_width)
         # number of aliens per row (Integer value)
@@ -220,40 +529,51 @@ class AlienInvasion:
         # Number of rows [Column height] (Integer value)                      
         number_rows = available_space_y // (2 * alien_height)
         
-        # Create the full fleet of aliens.
-        for row_number in range(number_rows): # go through each row of aliens
-            for alien_number in range(number_aliens_x): # each alien in current row
-                # Create an alien and place it in the row.
-                self._create_alien(alien_number, row_number)
-
-    def _create_alien(self, alien_number, row_number):
-        """Create an alien and place it in the row."""
-        alien = Alien(self) # Instantiate alien
-        alien_width, alien_height = alien.rect.size # Set alien size
-        # set alien horizontal location
-        alien.x = alien_width + 2 * alien_width * alien_number
-        alien.rect.x = alien.x # set alien horizontal coordinates
-        # set alien vertical coordinates
-        alien.rect.y = alien.rect.height + 2 * alien.rect.height * row_number
-        self.aliens.add(alien) # add current alien to list of aliens
+        # Create the full fleet of aliens, placing each alien in its row.
+        self.aliens.create_grid(number_aliens_x, number_rows)
 
     def _check_fleet_edges(self):
         """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites(): # travers list of alien bmp images
-            if alien.check_edges(): # if at edge of screen
-                # Drop the entire fleet and change the fleet's direction
-                self._change_fleet_direction()
-                break # exit loop
+        if self.aliens.check_edges(): # if the outermost alien is at edge of screen
+            # Drop the entire fleet and change the fleet's direction
+            self._change_fleet_direction()
             
     def _change_fleet_direction(self):
         """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():  # travers list of alien bmp images
-            alien.rect.y += self.settings.fleet_drop_speed # reduce y coordinates
+        self.aliens.drop(self.settings.fleet_drop_speed) # reduce y coordinates
         # inverse fleet direction to negative of current value
         self.settings.fleet_direction *= -1
 
+    def _set_mode(self, size, flags=0):
+        """Return the display surface, synchronized to vsync if asked.
+
+        Without vsync, and then without SDL scaling, if the display
+        doesn't support them.
+        """
+        if self.settings.vsync:
+            try:
+                return pygame.display.set_mode(size, flags, vsync=1)
+            except pygame.error:
+                pass # not supported here; show frames unsynchronized
+        try:
+            return pygame.display.set_mode(size, flags)
+        except pygame.error:
+            if not flags & pygame.SCALED:
+                raise
+        # No renderer to scale with; use a display of the logical size.
+        return pygame.display.set_mode(size, flags & ~pygame.SCALED)
+
     def _update_screen(self):
         """Update images on the screen, and flip to the new screen."""
+        if self.renderer: # only redraw what changed
+            self.renderer.update_screen()
+            return
+
+        self._draw_screen() # draw every object
+        pygame.display.flip() # Update the full display Surface to the screen
+
+    def _draw_screen(self):
+        """Draw every object onto the screen."""
         self.screen.fill(self.settings.bg_color) # paint screen to bg_color
         self.ship.blitme() # Draw the ship at its current location.
         for bullet in self.bullets.sprites(): # traverse list of bullet bmp images
@@ -267,10 +587,57 @@ class AlienInvasion:
         if not self.stats.game_active: # if game not active
             self.play_button.draw_button() # draw play button
 
-        pygame.display.flip() # Update the full display Surface to the screen
-
 
 if __name__ == '__main__':
-    # Make a game instance, and run the game.
-    ai = AlienInvasion() # instantiate game AI
-    ai.run_game() # start the main game loop
+    parser = argparse.ArgumentParser(description="Play Alien Invasion.")
+    parser.add_argument('--record', metavar='FILE',
+        help="record the game's input to FILE")
+    parser.add_argument('--replay', metavar='FILE',
+        help="play back a recording instead of playing")
+    parser.add_argument('--fast', action='store_true',
+        help="replay headless, as fast as possible")
+    parser.add_argument('--frame-stats', action='store_true',
+        help="time each phase of every frame and export them on exit")
+    parser.add_argument('--load', metavar='FILE',
+        help="start from a snapshot saved with F6")
+    parser.add_argument('--startup-report', action='store_true',
+        help="print where startup time went and image cache use")
+    parser.add_argument('--latency', action='store_true',
+        help="print input-to-display latency on exit")
+    parser.add_argument('--telemetry', metavar='DIR',
+        help="log gameplay events to compressed files in DIR")
+    parser.add_argument('--scaled', action='store_true',
+        help="draw at the Settings screen size and scale it to the display")
+    parser.add_argument('--render-scale', type=float,
+        help="with --scaled, multiply the drawn size by this "
+            "(default Settings.render_scale)")
+    args = parser.parse_args()
+    if args.load and args.record:
+        parser.error("a recording can't start from a snapshot")
+
+    if args.replay:
+        recording = Recording(args.replay) # recorded input and settings
+        ai = AlienInvasion.from_recording(recording, headless=args.fast)
+        if not ai.run_replay(recording):
+            sys.exit(f"replay diverged: expected score, level, ships_left of "
+                f"{recording.final}, got {(ai.stats.score, ai.stats.level, ai.stats.ships_left)}")
+        print("replay matched", recording.final)
+    else:
+        # Make a game instance, and run the game.
+        settings = Settings()
+        settings.frame_stats = args.frame_stats # time every frame
+        settings.report_latency = args.latency # time input to display
+        settings.report_startup = settings.report_startup or args.startup_report
+        settings.telemetry_dir = args.telemetry or settings.telemetry_dir
+        settings.scaled = settings.scaled or args.scaled # fixed logical size
+        if args.render_scale is not None: # else keep Settings.render_scale
+            settings.render_scale = args.render_scale
+        ai = AlienInvasion(settings=settings) # instantiate game AI
+        if args.load: # continue a saved game
+            try:
+                load_snapshot(ai, args.load)
+            except (OSError, ValueError) as error:
+                sys.exit(f"can't load snapshot: {error}")
+        if args.record: # keep every tick's input for replays
+            ai.start_recording(args.record)
+        ai.run_game() # start the main game loop
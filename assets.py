@@ -0,0 +1,45 @@
+import pygame
+
+class AssetManager:
+    """A class to load each image once and share it between sprites."""
+
+    def __init__(self, ai_game):
+        """Initialize an empty image cache."""
+        self.headless = ai_game.headless # no display format to convert to
+        self.images = {} # loaded images by file path
+        self.masks = {} # collision masks by file path
+
+        # Cache statistics.
+        self.hits = 0 # lookups served from the cache
+        self.misses = 0 # lookups that loaded the image from disk
+
+    def load_image(self, path):
+        """Return the image at path, loading it from disk on first use."""
+        image = self.images.get(path) # image if already loaded
+        if image is not None:
+            self.hits += 1 # served from the cache
+            return image
+
+        self.misses += 1 # has to be read and decoded
+        image = pygame.image.load(path) # read image from disk
+        if not self.headless:
+            # Convert to the display pixel format once, so blits don't have to.
+            image = image.convert_alpha()
+        self.images[path] = image # share image with later sprites
+        return image
+
+    def load_mask(self, path):
+        """Return the collision mask of the image at path, made on first use."""
+        mask = self.masks.get(path) # mask if already made
+        if mask is None:
+            # Opaque pixels (alpha above half) are solid.
+            mask = pygame.mask.from_surface(self.load_image(path))
+            self.masks[path] = mask # share mask with later sprites
+        return mask
+
+    def report(self):
+        """Return a one-line summary of the cache statistics."""
+        lookups = self.hits + self.misses # total number of lookups
+        hit_rate = self.hits / lookups if lookups else 0.0 # fraction served from cache
+        return (f"images: {len(self.images)} cached, {self.hits} hits, "
+                f"{self.misses} misses ({hit_rate:.1%} hit rate)")
@@ -0,0 +1,77 @@
+import queue
+import threading
+
+CLOSE_TIMEOUT = 5.0 # most seconds close() waits for the writer thread
+
+
+class BatchWriter:
+    """A class to write queued items in batches on a background thread.
+
+    The thread calls start() once, then write(batch, last) with up to
+    batch_size items at a time as they are queued, and finish() when it
+    stops, even if a write failed. After close() it goes on until the
+    queue is empty, so a backed-up queue doesn't leave a half-written file
+    behind.
+    """
+
+    def __init__(self, name, write, start=None, finish=None, max_items=0,
+            batch_size=256):
+        """Start a thread called name writing batches with write."""
+        self.write = write # writes a list of items; last is True at the end
+        self.start = start # called on the thread before the first batch
+        self.finish = finish # called on the thread after the last batch
+        self.batch_size = batch_size # most items written at once
+        self.queue = queue.Queue(max_items) # items waiting, 0 for no limit
+        self.stopping = threading.Event() # set by close()
+
+        self.thread = threading.Thread(target=self._run, name=name,
+            daemon=True) # writes queued items
+        self.thread.start()
+
+    def put(self, item):
+        """Queue item, waiting for room if the queue is full."""
+        self.queue.put(item)
+
+    def put_nowait(self, item):
+        """Queue item, raising queue.Full if there is no room."""
+        self.queue.put_nowait(item)
+
+    def close(self):
+        """Write everything queued, then stop the thread.
+
+        Waits at most CLOSE_TIMEOUT seconds, so a stuck or dead writer
+        can't hang quitting. Return True if the thread has stopped.
+        """
+        if self.thread.is_alive():
+            self.stopping.set()
+            try:
+                self.queue.put_nowait(None) # wake a thread waiting for items
+            except queue.Full:
+                pass # it isn't waiting, and sees stopping after this batch
+            self.thread.join(CLOSE_TIMEOUT)
+        return not self.thread.is_alive()
+
+    def _run(self):
+        """Write queued items in batches until close() is called."""
+        if self.start:
+            self.start()
+        try:
+            running = True
+            while running:
+                batch = [self.queue.get()] # wait for the next item
+                # Take whatever else is already queued, up to batch_size.
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                # After close(), stop once nothing is left to write.
+                if self.stopping.is_set() and self.queue.empty():
+                    running = False
+                batch = [item for item in batch if item is not None]
+                if batch or not running:
+                    self.write(batch, not running)
+        finally:
+            if self.finish:
+                self.finish()
@@ -0,0 +1,211 @@
+"""Benchmark the per-frame hot paths of Alien Invasion.
+
+Each case builds a game at one screen size with the dummy SDL video
+driver and times single calls of _create_fleet, _update_bullets (which
+includes _check_bullet_alien_collisions), _update_aliens, _update_screen
+and Scoreboard.prep_score. Results are written as JSON with p50/p99 times
+per call and allocation figures, and compared against a stored baseline:
+any case whose p50 or p99 grows beyond the tolerance fails the run, and
+so does a missing baseline unless --allow-missing is given.
+
+    python benchmark.py                     # compare with benchmark_baseline.json
+    python benchmark.py --save-baseline     # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy') # no window needed
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+
+# (case name, screen size, settings to change)
+CASES = [
+    ('1200x800', (1200, 800), {}), # the Settings default
+    ('1920x1080', (1920, 1080), {}),
+    ('3840x2160', (3840, 2160), {}), # 4K
+    ('7680x4320', (7680, 4320), {}), # 8K
+    # stress cases for collisions, with and without pixel tests
+    ('3840x2160-bullets', (3840, 2160), {'bullets_allowed': 500}),
+    ('3840x2160-bullets-rects', (3840, 2160),
+        {'bullets_allowed': 500, 'pixel_collisions': False}),
+]
+
+
+def make_game(size, overrides):
+    """Return an active game at size, with nothing saved to disk."""
+    settings = Settings()
+    settings.score_db = None # benchmark games are not saved
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    ai = AlienInvasion(size=size, settings=settings)
+    ai._start_game() # skip the Play button
+    return ai
+
+
+def fill_bullets(ai, rng):
+    """Fire bullets from random positions until bullets_allowed are in flight."""
+    while len(ai.bullets) < ai.settings.bullets_allowed:
+        ai.ship.x = rng.uniform(0, ai.screen_rect.width - ai.ship.rect.width)
+        ai.ship.rect.x = ai.ship.x # move ship under a new column
+        # Start each bullet somewhere on the screen, not just above the ship.
+        ai._fire_bullet()
+        bullet = ai.bullets.sprites()[-1] # newest bullet
+        bullet.y = rng.uniform(0, ai.screen_rect.height)
+        bullet.rect.y = bullet.y
+
+
+def hot_paths(ai, rng):
+    """Return (name, setup, call) for each path to time in ai."""
+    def reset_fleet():
+        ai.aliens.empty() # _create_fleet expects an empty fleet
+        ai.settings.fleet_direction = 1
+
+    def keep_playing():
+        fill_bullets(ai, rng)
+        if not ai.stats.game_active or ai.stats.ships_left < 1:
+            ai._start_game() # keep the fleet and ship in play
+
+    def add_points():
+        ai.stats.score += ai.settings.alien_points # score to render
+
+    return [
+        ('_create_fleet', reset_fleet, ai._create_fleet),
+        ('_update_bullets', keep_playing, ai._update_bullets),
+        ('_update_aliens', keep_playing, ai._update_aliens),
+        ('_update_screen', keep_playing, ai._update_screen),
+        ('prep_score', add_points, ai.sb.prep_score),
+    ]
+
+
+def time_calls(setup, call, calls):
+    """Return per-call times in seconds and allocation figures for call."""
+    times = []
+    for _ in range(calls):
+        setup()
+        start = perf_counter()
+        call()
+        times.append(perf_counter() - start)
+
+    # Measure allocations separately, since tracing slows every call down.
+    blocks = 0 # blocks still allocated after each call
+    peak = 0 # most memory a single call held at once
+    tracemalloc.start()
+    for _ in range(min(calls, 50)):
+        setup()
+        before = sys.getallocatedblocks()
+        tracemalloc.reset_peak()
+        size, _ = tracemalloc.get_traced_memory()
+        call()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - size)
+        blocks += sys.getallocatedblocks() - before
+    tracemalloc.stop()
+    return times, blocks / min(calls, 50), peak
+
+
+def percentile(values, fraction):
+    """Return the value below which fraction of values fall."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(calls, seed, only=None):
+    """Time every hot path of every case and return the results."""
+    results = {} # results by "case/path"
+    for case, size, overrides in CASES:
+        if only and only not in case:
+            continue
+        rng = random.Random(seed) # same bullets for every run
+        ai = make_game(size, overrides)
+        for name, setup, call in hot_paths(ai, rng):
+            times, blocks, peak = time_calls(setup, call, calls)
+            results[f"{case}/{name}"] = {
+                'calls': calls,
+                'p50_us': round(percentile(times, 0.50) * 1e6, 2),
+                'p99_us': round(percentile(times, 0.99) * 1e6, 2),
+                'net_blocks_per_call': round(blocks, 2),
+                'peak_alloc_kib': round(peak / 1024, 2),
+            }
+            print(f"{case:>24} {name:<16} p50 {results[f'{case}/{name}']['p50_us']:>10.1f} us"
+                f"  p99 {results[f'{case}/{name}']['p99_us']:>10.1f} us")
+        pygame.display.quit() # free the large screens between cases
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a message for every result slower than baseline allows."""
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue # new case, nothing to compare with
+        for stat in ('p50_us', 'p99_us'): # the median and the tail
+            limit = baseline[key][stat] * (1 + tolerance) # slowest allowed
+            if result[stat] > limit:
+                regressions.append(f"{key}: {stat[:3]} {result[stat]:.1f} us, "
+                    f"baseline {baseline[key][stat]:.1f} us")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200,
+        help="timed calls per hot path (default 200)")
+    parser.add_argument('--seed', type=int, default=1,
+        help="seed for bullet positions (default 1)")
+    parser.add_argument('--case', help="only run cases whose name contains CASE")
+    parser.add_argument('--output', default='benchmark_results.json',
+        help="file to write results to (default benchmark_results.json)")
+    parser.add_argument('--baseline', default='benchmark_baseline.json',
+        help="baseline to compare with (default benchmark_baseline.json)")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+        help="allowed p50 and p99 slowdown over the baseline (default 0.25)")
+    parser.add_argument('--save-baseline', action='store_true',
+        help="store the results as the new baseline")
+    parser.add_argument('--allow-missing', action='store_true',
+        help="pass when there is no baseline to compare with")
+    args = parser.parse_args()
+
+    results = run(args.calls, args.seed, args.case)
+    report = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"saved baseline to {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    except FileNotFoundError:
+        message = f"no baseline at {args.baseline}; run with --save-baseline"
+        if args.allow_missing:
+            print(message)
+            return
+        sys.exit(message) # nothing gated is a failure
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print("REGRESSION", regression)
+    if regressions:
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == '__main__':
+    main()
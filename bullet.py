@@ -1,12 +1,16 @@
 import pygame
-from pygame.sprite import Sprite
- 
-class Bullet(Sprite):
-    """A class to manage bullets fired from the ship"""
+
+class Bullet:
+    """A class to manage bullets fired from the ship
+
+    Bullets are pooled by BulletGroup: a spent bullet is reset and fired
+    again instead of being reallocated, so it keeps its slots and rect.
+    """
+
+    __slots__ = ('screen', 'settings', 'color', 'rect', 'y', 'group')
 
     def __init__(self, ai_game):
         """Create a bullet object at the ship's current position."""
-        super().__init__() # initialize using parent class __init__
         self.screen = ai_game.screen # initialize screen
         self.settings = ai_game.settings # initialize settings
         self.color = self.settings.bullet_color # initialize bullet color
@@ -14,9 +18,15 @@ class Bullet(Sprite):
         # Create a bullet rect at (0, 0) and then set correct position.
         self.rect = pygame.Rect(0, 0, self.settings.bullet_width,
             self.settings.bullet_height)
-        # set bullet position to middle of top of screen
-        self.rect.midtop = ai_game.ship.rect.midtop
-        
+        self.group = None # group the bullet is in flight in
+        self.reset(ai_game.ship) # set bullet position to top of ship
+
+    def reset(self, ship):
+        """Place the bullet at the middle of the top of the ship."""
+        self.color = self.settings.bullet_color # settings may have changed
+        self.rect.size = (self.settings.bullet_width, self.settings.bullet_height)
+        self.rect.midtop = ship.rect.midtop
+
         # Store the bullet's position as a decimal value.
         self.y = float(self.rect.y)
 
@@ -30,3 +40,12 @@ class Bullet(Sprite):
     def draw_bullet(self):
         """Draw the bullet to the screen."""
         pygame.draw.rect(self.screen, self.color, self.rect)
+
+    def alive(self):
+        """Return True while the bullet is in flight."""
+        return self.group is not None
+
+    def kill(self):
+        """Remove the bullet from its group, returning it to the pool."""
+        if self.group is not None:
+            self.group.remove(self)
@@ -0,0 +1,81 @@
+from bullet import Bullet
+
+class BulletGroup:
+    """A class to hold the bullets in flight, reusing spent ones.
+
+    Bullets that leave the screen, hit an alien or are cleared go back to
+    a pool, and firing takes a bullet from the pool before making a new
+    one, so a long game stops allocating bullets once the pool has grown
+    to bullets_allowed. The group behaves like a pygame.sprite.Group of
+    bullets, and counts pool hits and misses to confirm the reuse.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize an empty group and pool."""
+        self.ai_game = ai_game # game the bullets are fired in
+        self.bullets = [] # bullets in flight, in firing order
+        self.pool = [] # spent bullets ready to be fired again
+
+        # Pool statistics.
+        self.hits = 0 # bullets fired from the pool
+        self.misses = 0 # bullets that had to be made
+
+    def fire(self):
+        """Fire a bullet from the top of the ship and return it."""
+        if self.pool:
+            self.hits += 1 # reuse a spent bullet
+            bullet = self.pool.pop()
+            bullet.reset(self.ai_game.ship)
+        else:
+            self.misses += 1 # the pool has to grow
+            bullet = Bullet(self.ai_game)
+        bullet.group = self # now in flight
+        self.bullets.append(bullet)
+        return bullet
+
+    def __len__(self):
+        """Return the number of bullets in flight."""
+        return len(self.bullets)
+
+    def __bool__(self):
+        """Return True while any bullet is in flight."""
+        return bool(self.bullets)
+
+    def __iter__(self):
+        """Iterate over the bullets in flight in firing order."""
+        return iter(self.bullets)
+
+    def sprites(self):
+        """Return a list of the bullets in flight, like Group.sprites."""
+        return list(self.bullets) # safe to kill bullets while iterating
+
+    def update(self):
+        """Move every bullet up the screen."""
+        for bullet in self.bullets:
+            bullet.update()
+
+    def remove(self, bullet):
+        """Stop bullet's flight and return it to the pool."""
+        self.bullets.remove(bullet)
+        bullet.group = None
+        self.pool.append(bullet)
+
+    def remove_offscreen(self):
+        """Return bullets that have left the top of the screen to the pool."""
+        # Compact the bullets still on screen in place, without a copy.
+        kept = 0 # bullets kept so far
+        for bullet in self.bullets:
+            if bullet.rect.bottom <= 0: # bullet is out of range
+                bullet.group = None
+                self.pool.append(bullet)
+            else:
+                self.bullets[kept] = bullet
+                kept += 1
+        del self.bullets[kept:]
+
+    def empty(self):
+        """Return every bullet in flight to the pool."""
+        for bullet in self.bullets:
+            bullet.group = None
+        self.pool.extend(self.bullets)
+        self.bullets.clear()
@@ -5,17 +5,21 @@ class Button:
     def __init__(self, ai_game, msg):
         """Initialize button attributes."""
         self.screen = ai_game.screen # initialize screen
-        self.screen_rect = self.screen.get_rect() # reference to set rect size 
+        self.screen_rect = ai_game.screen_rect # reference to set rect size 
+        self.headless = ai_game.headless # nothing is rendered when headless
         
         # Set the dimensions and properties of the button.
         self.width, self.height = 200, 90 # width and height in pixels of button
         self.button_color = (42,245,255) # green button
         self.text_color = (0, 0, 0) # White font color
-        self.font = pygame.font.SysFont("comicsansms", 48) # set font
         
         # Build the button's rect object and center it.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
         self.rect.center = self.screen_rect.center # center button
+
+        if self.headless: # the button can still be clicked, but not drawn
+            return
+        self.font = ai_game.fonts.get_font("comicsansms", 48) # set font
         
         # The button message needs to be prepped only once.
         self._prep_msg(msg)
@@ -0,0 +1,84 @@
+import math
+
+
+class FleetIndex:
+    """A class to find the aliens a rect may overlap without testing them all.
+
+    While the fleet keeps the formation built by create_grid, the columns
+    and rows under a rect are computed directly from its coordinates. Any
+    other layout falls back to a uniform spatial hash. Both are relative to
+    the fleet's first slot, which moves with the rest of the fleet, and
+    return a superset of the overlapping slots for the fleet to test
+    exactly.
+    """
+
+    def __init__(self, fleet):
+        """Initialize an empty index for fleet."""
+        self.fleet = fleet # fleet whose slots are indexed
+        self.grid = None # (columns, rows) while the aliens are in formation
+        self.cells = {} # slots in each spatial hash cell otherwise
+
+    def build(self, grid=None):
+        """Index the fleet's current layout.
+
+        grid is (number_aliens_x, number_rows) when the fleet holds the
+        formation from create_grid; without it a spatial hash is built.
+        """
+        self.grid = grid # formation the slots are laid out in
+        self.cells = {} # drop the previous hash
+        if grid is not None or not len(self.fleet.x):
+            return # formation needs no hash
+
+        fleet = self.fleet
+        # Positions relative to slot 0 stay fixed while the fleet moves.
+        rel_x = (fleet.x - fleet.x[0]).tolist()
+        rel_y = (fleet.y - fleet.y[0]).tolist()
+        for slot, (x, y) in enumerate(zip(rel_x, rel_y)):
+            # Add the slot to every cell its rect covers.
+            for cell_x in range(math.floor(x / fleet.width),
+                    math.floor((x + fleet.width) / fleet.width) + 1):
+                for cell_y in range(math.floor(y / fleet.height),
+                        math.floor((y + fleet.height) / fleet.height) + 1):
+                    self.cells.setdefault((cell_x, cell_y), []).append(slot)
+
+    def candidates(self, rect):
+        """Return the slots, in order, of aliens that may overlap rect."""
+        fleet = self.fleet
+        if not len(fleet.x):
+            return [] # nothing to overlap
+
+        # rect relative to slot 0, padded a pixel for rounding differences
+        x, y = fleet.x.item(0), fleet.y.item(0) # position of slot 0
+        left, right = rect.left - x - 1, rect.right - x + 1
+        top, bottom = rect.top - y - 1, rect.bottom - y + 1
+
+        if self.grid is not None:
+            return self._grid_candidates(left, right, top, bottom)
+        return self._hash_candidates(left, right, top, bottom)
+
+    def _grid_candidates(self, left, right, top, bottom):
+        """Return the formation slots overlapping the relative rect."""
+        fleet = self.fleet
+        number_aliens_x, number_rows = self.grid # size of the formation
+        # Aliens are 2w apart horizontally and 2h apart vertically.
+        pitch_x, pitch_y = 2 * fleet.width, 2 * fleet.height
+
+        first_alien = max(0, math.floor((left - fleet.width) / pitch_x))
+        last_alien = min(number_aliens_x - 1, math.floor(right / pitch_x))
+        first_row = max(0, math.floor((top - fleet.height) / pitch_y))
+        last_row = min(number_rows - 1, math.floor(bottom / pitch_y))
+        # slot = row_number * number_aliens_x + alien_number
+        return [row_number * number_aliens_x + alien_number
+            for row_number in range(first_row, last_row + 1)
+            for alien_number in range(first_alien, last_alien + 1)]
+
+    def _hash_candidates(self, left, right, top, bottom):
+        """Return the hashed slots overlapping the relative rect."""
+        fleet = self.fleet
+        slots = set() # slots in every cell the rect covers
+        for cell_x in range(math.floor(left / fleet.width),
+                math.floor(right / fleet.width) + 1):
+            for cell_y in range(math.floor(top / fleet.height),
+                    math.floor(bottom / fleet.height) + 1):
+                slots.update(self.cells.get((cell_x, cell_y), ()))
+        return sorted(slots) # in creation order
@@ -0,0 +1,98 @@
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+# Window events after which the whole screen has to be drawn again.
+REDRAW_TYPES = (pygame.VIDEOEXPOSE, pygame.VIDEORESIZE, pygame.WINDOWEXPOSED,
+    pygame.WINDOWSHOWN, pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED,
+    pygame.WINDOWSIZECHANGED)
+# The only event types the game handles; everything else stays out of the queue.
+EVENT_TYPES = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN) + REDRAW_TYPES
+# Event types that are timed until a frame shows their effect.
+INPUT_TYPES = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN)
+
+
+class Controls:
+    """A class to bind keys to game actions and time input latency.
+
+    Settings.key_bindings maps the name of a pygame key constant, without
+    its K_ prefix (e.g. 'RIGHT', 'SPACE', 'q'), to the name of an action;
+    actions maps each action name to its (pressed, released) handlers,
+    either of which may be None. Lookups are a dict access per event.
+
+    Each input is timestamped when it is read from the queue, and its
+    latency is the time until the first frame shown after it was handled
+    and the simulation ticked, so its effect is on screen.
+    """
+
+    def __init__(self, ai_game, actions, capacity=1024):
+        """Bind the keys in ai_game's settings to actions."""
+        self.settings = ai_game.settings # initialize settings
+        self.stats = ai_game.stats # inputs only wait for ticks while active
+        self.keydown = {} # key code -> handler for the key being pressed
+        self.keyup = {} # key code -> handler for the key being released
+        for name, action in self.settings.key_bindings.items():
+            key = getattr(pygame, 'K_' + name, None) # key constant
+            if key is None:
+                raise ValueError(f"unknown key {name!r} in key_bindings")
+            if action not in actions:
+                raise ValueError(f"unknown action {action!r} bound to {name!r}")
+            pressed, released = actions[action]
+            if pressed:
+                self.keydown[key] = pressed
+            if released:
+                self.keyup[key] = released
+
+        self.waiting = [] # read times of inputs not shown yet
+        self.latencies = deque(maxlen=capacity) # seconds, most recent inputs
+        self.count = 0 # inputs timed since the game started
+
+    def filter_events(self):
+        """Keep event types the game doesn't handle out of the queue."""
+        pygame.event.set_blocked(None) # block every type...
+        pygame.event.set_allowed(EVENT_TYPES) # ...except the handled ones
+
+    def read(self, events):
+        """Timestamp the inputs among events, which were just read."""
+        now = perf_counter()
+        for event in events:
+            if event.type in INPUT_TYPES:
+                self.waiting.append(now)
+
+    def frame_shown(self, ticked):
+        """Time the waiting inputs once a frame that reflects them is shown.
+
+        ticked is whether the simulation advanced before the frame; while
+        a game is active the input only shows once it has.
+        """
+        if not self.waiting or (self.stats.game_active and not ticked):
+            return
+        now = perf_counter()
+        self.latencies.extend(now - read for read in self.waiting)
+        self.count += len(self.waiting)
+        self.waiting.clear()
+
+    def percentile(self, fraction):
+        """Return the latency in seconds that fraction of recent inputs beat."""
+        if not self.latencies:
+            return 0.0
+        return float(np.percentile(self.latencies, fraction * 100))
+
+    def summary(self):
+        """Return the recent input latencies in milliseconds, for exports."""
+        return {
+            'inputs': self.count,
+            'p50_ms': round(self.percentile(0.50) * 1000, 2),
+            'p99_ms': round(self.percentile(0.99) * 1000, 2),
+            'max_ms': round(max(self.latencies, default=0.0) * 1000, 2),
+        }
+
+    def report(self):
+        """Return a one-line summary of the input latencies."""
+        summary = self.summary()
+        return (f"input latency: {summary['inputs']} inputs, "
+            f"p50 {summary['p50_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms, "
+            f"max {summary['max_ms']:.2f} ms")
@@ -0,0 +1,332 @@
+import numpy as np
+import pygame
+
+from alien import Alien
+from collisions import FleetIndex
+
+
+def rect_coords(values):
+    """Round positions the way pygame.Rect does (half away from zero)."""
+    whole = np.trunc(values) # integer part, rounded toward zero
+    half = np.abs(values - whole) >= 0.5 # fractional part rounds away
+    return (whole + np.copysign(half, values)).astype(np.int64)
+
+
+def rect_coord(value):
+    """Round a single position the way pygame.Rect does."""
+    whole = int(value) # integer part, rounded toward zero
+    if abs(value - whole) >= 0.5: # fractional part rounds away
+        whole += 1 if value > 0 else -1
+    return whole
+
+
+class Fleet:
+    """A class to manage the alien fleet as arrays of positions.
+
+    Positions and alive flags are kept in NumPy arrays so that moving or
+    dropping the whole fleet is a single array operation, and the index of
+    the outermost living aliens is tracked so edge checks cost O(1). The
+    fleet draws and collides like a pygame.sprite.Group of aliens.
+
+    With Settings.fleet_surface a formation from create_grid is drawn from
+    pre-composited surfaces, one per row: aliens never move relative to
+    each other, so the rows are built once, killed aliens are erased from
+    them, and each frame draws the whole fleet with a single blits call.
+    The rows of the next formation are prepared a row per frame by
+    prepare(), so a new level or ship swaps in a ready fleet.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize an empty fleet."""
+        self.settings = ai_game.settings # initialize settings
+        self.screen_rect = ai_game.screen_rect # initialize world rect
+
+        # Every alien shares one image and size.
+        self.image = ai_game.assets.load_image('images/alien.bmp')
+        self.width, self.height = self.image.get_size() # size of one alien
+        # Solid pixels of an alien, when collisions are pixel accurate.
+        self.mask = (ai_game.assets.load_mask('images/alien.bmp')
+            if self.settings.pixel_collisions else None)
+        self.solid_masks = {} # fully solid masks by size, for bullets
+        self.mask_tests = 0 # pixel tests run after a rect overlap
+
+        # Index of the slots each part of the screen may hold.
+        self.index = FleetIndex(self)
+
+        # Alien handles are kept across rebuilds; slot i always uses aliens[i].
+        self.aliens = [] # Alien handle for each slot ever used
+        self.hits = 0 # handles reused by a rebuild
+        self.misses = 0 # handles that had to be made
+
+        self.rows = None # pre-composited formation rows, built when first drawn
+        self.next_grid = None # formation the next rows are prepared for
+        self.next_rows = [] # rows of the next formation prepared so far
+
+        self.generation = 0 # bumped whenever the fleet is rebuilt
+        self.empty() # start without any aliens
+
+    def empty(self):
+        """Remove all aliens from the fleet."""
+        self.x = np.empty(0) # exact horizontal position of each alien
+        self.y = np.empty(0, dtype=np.int64) # vertical position of each alien
+        self.alive = np.empty(0, dtype=bool) # which aliens are still alive
+        self.count = 0 # number of living aliens
+        self.rows = None # nothing to draw
+        self.generation += 1 # layout changed
+
+        # Slots of the outermost living aliens.
+        self.left = self.right = self.bottom = 0
+        self.index.build() # nothing left to index
+
+    def create_grid(self, number_aliens_x, number_rows):
+        """Fill the fleet with rows of aliens spaced one alien apart."""
+        alien_number = np.tile(np.arange(number_aliens_x), number_rows)
+        row_number = np.repeat(np.arange(number_rows), number_aliens_x)
+        # x = w + 2w * alien_number, y = h + 2h * row_number
+        self.set_positions(
+            self.width + 2 * self.width * alien_number,
+            self.height + 2 * self.height * row_number,
+            grid=(number_aliens_x, number_rows))
+
+        if (self.next_grid == (number_aliens_x, number_rows) and
+                len(self.next_rows) == number_rows):
+            # Swap in the rows prepared ahead of time, and start on the next.
+            self.rows, self.next_rows = self.next_rows, []
+
+    def prepare(self, screen):
+        """Composite one row of the next formation ahead of time.
+
+        Called once per frame, so the cost of compositing and encoding a
+        formation is spread over idle frames instead of landing on the
+        frame that starts a new level or ship.
+        """
+        if not self.settings.fleet_surface or self.index.grid is None:
+            return # nothing to composite
+        if self.next_grid != self.index.grid: # the formation changed size
+            self.next_grid, self.next_rows = self.index.grid, []
+        number_aliens_x, number_rows = self.next_grid
+        if not number_aliens_x or len(self.next_rows) == number_rows:
+            return # no aliens fit, or the next formation is ready
+
+        # Every create_grid formation has the same rows, all alive.
+        row = self._composite_row(
+            [2 * self.width * alien_number
+                for alien_number in range(number_aliens_x)],
+            [True] * number_aliens_x)
+        if number_aliens_x > 1:
+            # Blit a transparent pixel from the gap between the first two
+            # aliens, so SDL encodes the row for screen now, not when drawn.
+            screen.blit(row, (0, 0), (self.width, 0, 1, 1))
+        self.next_rows.append((row, 0, 2 * self.height * len(self.next_rows)))
+
+    def set_positions(self, x, y, alive=None, grid=None):
+        """Replace the fleet with aliens at the given positions.
+
+        grid is (number_aliens_x, number_rows) if the positions are the
+        formation laid out by create_grid.
+        """
+        self.x = np.array(x, dtype=float) # copy so callers keep their arrays
+        self.y = np.array(y, dtype=np.int64)
+        if alive is None:
+            self.alive = np.ones(len(self.x), dtype=bool) # all start alive
+        else:
+            self.alive = np.array(alive, dtype=bool)
+        # Reuse the handles of earlier fleets, making only the missing ones.
+        reused = min(len(self.aliens), len(self.x))
+        self.hits += reused
+        self.misses += len(self.x) - reused
+        self.aliens.extend(Alien(self, index)
+            for index in range(len(self.aliens), len(self.x)))
+        self.rows = None # composited again when next drawn
+        self.generation += 1 # layout changed
+        self.index.build(grid) # index the new layout
+        self._update_bounds() # find the outermost aliens
+
+    def __len__(self):
+        """Return the number of living aliens."""
+        return self.count
+
+    def __bool__(self):
+        """Return True while any alien is alive."""
+        return self.count > 0
+
+    def __iter__(self):
+        """Iterate over the living aliens in creation order."""
+        return iter(self.sprites())
+
+    def sprites(self):
+        """Return a list of the living aliens in creation order."""
+        return [self.aliens[index] for index in np.flatnonzero(self.alive)]
+
+    def update(self):
+        """Move every alien right or left."""
+        # direction and speed, applied to the whole fleet at once
+        self.x += self.settings.alien_speed * self.settings.fleet_direction
+
+    def check_edges(self):
+        """Return True if any alien is at an edge of the screen."""
+        if not self.count:
+            return False # no aliens to reach an edge
+        left = rect_coord(self.x.item(self.left)) # leftmost alien's rect.x
+        right = rect_coord(self.x.item(self.right)) + self.width # rightmost rect.right
+        return right >= self.screen_rect.right or left <= 0
+
+    def check_bottom(self):
+        """Return True if any alien has reached the bottom of the screen."""
+        if not self.count:
+            return False # no aliens to reach the bottom
+        return self.y.item(self.bottom) + self.height >= self.screen_rect.bottom
+
+    def drop(self, distance):
+        """Move every alien down by distance pixels."""
+        self.y += distance
+
+    def kill(self, index):
+        """Remove the alien in slot index from the fleet."""
+        if self.alive[index]:
+            self.alive[index] = False # no longer drawn or collided
+            self.count -= 1
+            self._erase([index]) # remove it from the composited fleet
+            self._update_bounds() # outermost aliens may have changed
+
+    def collide(self, bullets):
+        """Remove bullets and the aliens they hit, like groupcollide.
+
+        Return a dict mapping each bullet that hit to the list of aliens it
+        hit. Bullets are tested in group order and each alien can only be
+        hit by the first bullet that reaches it.
+        """
+        collisions = {} # aliens hit by each bullet
+        for bullet in bullets.sprites(): # bullets in group order
+            # slots of aliens under the bullet, which is solid throughout
+            hits = self._hits(bullet.rect, self._solid_mask(bullet.rect.size))
+            if hits:
+                self.alive[hits] = False # kill every alien that was hit
+                self.count -= len(hits)
+                self._erase(hits) # remove them from the composited fleet
+                collisions[bullet] = [self.aliens[index] for index in hits]
+                bullet.kill() # remove bullet from its group
+        if collisions:
+            self._update_bounds() # outermost aliens may have changed
+        return collisions
+
+    def collide_any(self, rect, mask=None):
+        """Return the first living alien colliding with rect, or None.
+
+        mask holds the solid pixels of the sprite at rect; without one the
+        whole rect is solid.
+        """
+        if mask is None:
+            mask = self._solid_mask(rect.size)
+        hits = self._hits(rect, mask) # slots of aliens overlapping rect
+        return self.aliens[hits[0]] if hits else None
+
+    def rects(self):
+        """Return a list of the rects of the living aliens."""
+        living = np.flatnonzero(self.alive) # slots still alive
+        return [pygame.Rect(x, y, self.width, self.height) for x, y in
+            zip(rect_coords(self.x[living]).tolist(), self.y[living].tolist())]
+
+    def draw(self, surface):
+        """Draw every living alien onto surface."""
+        if (self.rows is None and self.settings.fleet_surface and
+                self.index.grid is not None and self.count):
+            self._composite() # a new formation to composite
+        if self.rows is not None:
+            # Every row is a fixed whole number of pixels from slot 0.
+            x, y = rect_coord(self.x.item(0)), self.y.item(0)
+            surface.blits([(row, (x + left, y + top))
+                for row, left, top in self.rows], doreturn=False)
+            return
+
+        living = np.flatnonzero(self.alive) # slots to draw
+        positions = zip(rect_coords(self.x[living]).tolist(),
+            self.y[living].tolist()) # top left corner of each alien
+        surface.blits([(self.image, position) for position in positions],
+            doreturn=False)
+
+    def _hits(self, rect, mask=None):
+        """Return the slots of living aliens overlapping rect, in order.
+
+        With pixel collisions on, an alien whose rect overlaps only counts
+        if one of its solid pixels overlaps a solid pixel of mask.
+        """
+        if not self.count or rect.width <= 0 or rect.height <= 0:
+            return [] # nothing can overlap
+        hits = [] # slots of living aliens overlapping rect
+        for slot in self.index.candidates(rect): # only the few slots near rect
+            if not self.alive.item(slot):
+                continue # killed aliens don't collide
+            left = rect_coord(self.x.item(slot)) # alien's rect.x
+            top = self.y.item(slot) # alien's rect.y
+            if (left < rect.right and left + self.width > rect.left and
+                    top < rect.bottom and top + self.height > rect.top):
+                if self.mask is not None and mask is not None:
+                    # Only pairs whose rects overlap get a pixel test.
+                    self.mask_tests += 1
+                    if not self.mask.overlap(mask,
+                            (rect.left - left, rect.top - top)):
+                        continue # only transparent pixels overlap
+                hits.append(slot)
+        return hits
+
+    def _solid_mask(self, size):
+        """Return a shared mask of size with every pixel solid."""
+        if self.mask is None:
+            return None # rects are enough
+        mask = self.solid_masks.get(size)
+        if mask is None:
+            mask = pygame.Mask(size, fill=True)
+            self.solid_masks[size] = mask
+        return mask
+
+    def _composite(self):
+        """Composite the living aliens of each formation row onto one surface."""
+        number_aliens_x, number_rows = self.index.grid # size of the formation
+        # Integer offsets of each alien from slot 0, which stay fixed.
+        rel_x = (rect_coords(self.x) - rect_coord(self.x.item(0))).tolist()
+        rel_y = (self.y - self.y.item(0)).tolist()
+        alive = self.alive.tolist()
+
+        self.rows = [] # (surface, x, y) of each row relative to slot 0
+        for first in range(0, number_aliens_x * number_rows, number_aliens_x):
+            last = first + number_aliens_x # first slot of the next row
+            row = self._composite_row(
+                [x - rel_x[first] for x in rel_x[first:last]], alive[first:last])
+            self.rows.append((row, rel_x[first], rel_y[first]))
+
+    def _composite_row(self, offsets, alive):
+        """Return a surface of the living aliens at offsets along a row."""
+        width = offsets[-1] + self.width # row length
+        row = pygame.Surface((width, self.height), pygame.SRCALPHA)
+        for offset, living in zip(offsets, alive):
+            if living:
+                # MAX onto transparent pixels copies the image exactly.
+                row.blit(self.image, (offset, 0),
+                    special_flags=pygame.BLEND_RGBA_MAX)
+        # Run-length encode the row, so blits skip the gaps between aliens.
+        # An erase re-encodes only the row it changed.
+        row.set_alpha(255, pygame.RLEACCEL)
+        return row
+
+    def _erase(self, slots):
+        """Clear the aliens in slots from the composited rows."""
+        if self.rows is None:
+            return # nothing composited yet
+        number_aliens_x = self.index.grid[0] # aliens in each row
+        for slot in slots:
+            row, left, top = self.rows[slot // number_aliens_x]
+            x = rect_coord(self.x.item(slot)) - rect_coord(self.x.item(0)) - left
+            row.fill((0, 0, 0, 0), (x, 0, self.width, self.height))
+
+    def _update_bounds(self):
+        """Find the slots of the outermost living aliens."""
+        living = np.flatnonzero(self.alive) # slots still alive
+        self.count = living.size
+        if not self.count:
+            return # no bounds without aliens
+        # Aliens all move together, so these slots stay outermost until
+        # one of them is killed.
+        self.left = living[np.argmin(self.x[living])]
+        self.right = living[np.argmax(self.x[living])]
+        self.bottom = living[np.argmax(self.y[living])]
@@ -0,0 +1,47 @@
+import json
+import os
+
+import pygame.font
+
+class FontCache:
+    """A class to resolve and load each font once.
+
+    pygame.font.SysFont enumerates the system fonts to find a font file.
+    The name-to-file mapping is kept in a JSON file so that later runs
+    can skip that step, and loaded Font objects are shared by everyone
+    asking for the same name and size.
+    """
+
+    def __init__(self, path):
+        """Initialize the cache, reading resolved font files from path."""
+        self.path = path # file the resolved font files are kept in
+        self.files = {} # font file for each font name, None if not found
+        self.fonts = {} # loaded fonts by (name, size)
+        try:
+            with open(path) as f:
+                self.files = json.load(f) # resolved on an earlier run
+        except (OSError, ValueError):
+            pass # nothing cached yet, or an unreadable cache
+
+    def get_font(self, name, size):
+        """Return the named system font at size, like pygame.font.SysFont."""
+        font = self.fonts.get((name, size)) # font if already loaded
+        if font is None:
+            font = pygame.font.Font(self._resolve(name), size) # None is the default font
+            self.fonts[(name, size)] = font # share font with later callers
+        return font
+
+    def _resolve(self, name):
+        """Return the font file for name, looking it up only when needed."""
+        if name in self.files:
+            path = self.files[name] # resolved on an earlier call or run
+            if path is None or os.path.exists(path):
+                return path
+        # Enumerate system fonts, then remember the answer.
+        self.files[name] = pygame.font.match_font(name)
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(self.files, f, indent=2)
+        except OSError:
+            pass # the cache is only an optimization
+        return self.files[name]
@@ -0,0 +1,223 @@
+import cProfile
+import gc
+import json
+import sys
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+# Phases of a frame, in the order the game loop runs them.
+PHASES = ('events', 'ship', 'bullets', 'aliens', 'screen')
+# Columns of the ring buffer: frame time, each phase, then sprite counts.
+COLUMNS = ('frame',) + PHASES + ('aliens_count', 'bullets_count')
+
+HISTOGRAM_BIN = 0.0001 # seconds per histogram bin (0.1 ms)
+HISTOGRAM_BINS = 1000 # bins up to 100 ms; slower frames share the last bin
+
+
+class FrameStats:
+    """A class to time each phase of every frame of the game loop.
+
+    While running, the game's _check_events, _update_bullets,
+    _update_aliens and _update_screen and the ship's update are shadowed
+    by timed wrappers on the instances; stopping deletes the wrappers, so
+    the loop pays nothing when the instrumentation is off. Every frame
+    fills one row of a fixed ring buffer and one bin of a frame time
+    histogram. Only the game loop writes them, so no lock is needed.
+    """
+
+    def __init__(self, ai_game, capacity=4096):
+        """Initialize the buffers for the last capacity frames of ai_game."""
+        self.ai_game = ai_game # game being timed
+        self.settings = ai_game.settings # initialize settings
+
+        self.frames = np.zeros((capacity, len(COLUMNS))) # ring buffer of frames
+        self.count = 0 # frames recorded since the buffer was created
+        self.histogram = [0] * HISTOGRAM_BINS # frames in each frame time bin
+        self.row = [0.0] * len(COLUMNS) # frame being timed
+        self.last_frame = None # time the previous frame ended
+        self.wrapped = [] # (object, attribute) of each timed wrapper
+
+        self.overlay = False # show the statistics on screen
+        self.overlay_image = None # statistics rendered for the overlay
+        self.overlay_rect = None # where the overlay was last drawn
+        self.overlay_refresh = 0.0 # time the overlay text is next rendered
+        self.profiler = None # cProfile capture in progress
+
+    @property
+    def running(self):
+        """True while frames are being timed."""
+        return bool(self.wrapped)
+
+    def start(self):
+        """Start timing each phase of every frame."""
+        if self.running:
+            return
+        ai_game = self.ai_game
+        self._wrap(ai_game, '_check_events', PHASES.index('events'))
+        self._wrap(ai_game.ship, 'update', PHASES.index('ship'))
+        self._wrap(ai_game, '_update_bullets', PHASES.index('bullets'))
+        self._wrap(ai_game, '_update_aliens', PHASES.index('aliens'))
+        self._wrap(ai_game, '_update_screen', PHASES.index('screen'),
+            end_frame=True)
+        self.last_frame = None # the first frame has no start time
+
+    def stop(self):
+        """Stop timing, restoring the untimed methods."""
+        for owner, name in self.wrapped:
+            delattr(owner, name) # the class attribute shows through again
+        self.wrapped = []
+        self.overlay = False
+
+    def toggle_overlay(self):
+        """Show or hide the statistics overlay, timing frames while shown."""
+        if self.overlay:
+            self.overlay = False
+            if not self.settings.frame_stats: # only timed for the overlay
+                self.stop()
+        else:
+            self.start()
+            self.overlay = True
+            self.overlay_refresh = 0.0 # render the text on the next frame
+        renderer = self.ai_game.renderer
+        if renderer: # redraw the whole screen, with or without the overlay
+            renderer.state = None
+
+    def toggle_profile(self):
+        """Start a cProfile capture, or stop one and save it."""
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+            return
+        self.profiler.disable()
+        self.profiler.dump_stats(self.settings.frame_profile)
+        self.profiler = None
+        print(f"saved profile to {self.settings.frame_profile}", file=sys.stderr)
+
+    def percentile(self, fraction):
+        """Return the frame time in seconds that fraction of frames beat."""
+        total = sum(self.histogram)
+        if not total:
+            return 0.0
+        # First bin whose cumulative count reaches the fraction.
+        cumulative = np.cumsum(self.histogram)
+        index = int(np.searchsorted(cumulative, fraction * total))
+        return (index + 1) * HISTOGRAM_BIN # upper edge of the bin
+
+    def recorded(self):
+        """Return the rows still in the ring buffer, oldest first."""
+        capacity = len(self.frames)
+        if self.count <= capacity:
+            return self.frames[:self.count]
+        start = self.count % capacity # oldest row
+        return np.concatenate((self.frames[start:], self.frames[:start]))
+
+    def export(self, path):
+        """Write the recorded frames to path.csv and a summary to path.json."""
+        rows = self.recorded()
+        times = rows.copy()
+        times[:, :len(PHASES) + 1] *= 1000 # seconds to milliseconds
+        header = ",".join(f"{name}_ms" for name in ('frame',) + PHASES)
+        header += ",aliens,bullets"
+        np.savetxt(f"{path}.csv", times, fmt='%.4f', delimiter=',',
+            header=header, comments='')
+
+        summary = {
+            'frames': sum(self.histogram), # every frame, not just the buffer
+            'p50_ms': round(self.percentile(0.50) * 1000, 2),
+            'p99_ms': round(self.percentile(0.99) * 1000, 2),
+            'histogram_bin_ms': HISTOGRAM_BIN * 1000,
+            'histogram': self.histogram,
+            'pools': self.pools(),
+            'input_latency': self.ai_game.controls.summary(),
+            # Collections per generation; flat while the pools cover allocation.
+            'gc_collections': [generation['collections']
+                for generation in gc.get_stats()],
+        }
+        if len(rows):
+            summary['phases'] = {phase: {
+                'mean_ms': round(float(times[:, column].mean()), 4),
+                'p99_ms': round(float(np.percentile(times[:, column], 99)), 4),
+            } for column, phase in enumerate(PHASES, 1)}
+        with open(f"{path}.json", 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    def pools(self):
+        """Return the live counts and hit rates of the bullet and alien pools."""
+        bullets, aliens = self.ai_game.bullets, self.ai_game.aliens
+        return {
+            'bullets': {'live': len(bullets), 'pooled': len(bullets.pool),
+                'hits': bullets.hits, 'misses': bullets.misses},
+            'aliens': {'live': len(aliens), 'pooled': len(aliens.aliens),
+                'hits': aliens.hits, 'misses': aliens.misses},
+        }
+
+    def close(self):
+        """Save any profile in progress, and export the frames if asked to."""
+        if self.profiler is not None:
+            self.toggle_profile() # save the capture
+        # Only export when asked to, not after a look at the F3 overlay.
+        if (self.count and self.settings.frame_stats and
+                self.settings.frame_stats_path):
+            self.export(self.settings.frame_stats_path)
+
+    def _wrap(self, owner, name, phase, end_frame=False):
+        """Shadow owner.name with a wrapper timing it as phase."""
+        function = getattr(owner, name) # untimed bound method
+        row = self.row
+        column = phase + 1 # column 0 is the frame time
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            result = function(*args, **kwargs)
+            row[column] += perf_counter() - start
+            if end_frame:
+                self._end_frame()
+            return result
+
+        setattr(owner, name, timed)
+        self.wrapped.append((owner, name))
+
+    def _end_frame(self):
+        """Record the frame that just ended and start the next one."""
+        now = perf_counter()
+        row = self.row
+        if self.last_frame is not None: # the first frame has no start time
+            frame_time = now - self.last_frame
+            row[0] = frame_time
+            row[-2] = len(self.ai_game.aliens)
+            row[-1] = len(self.ai_game.bullets)
+            self.frames[self.count % len(self.frames)] = row
+            self.count += 1
+            self.histogram[min(int(frame_time / HISTOGRAM_BIN),
+                HISTOGRAM_BINS - 1)] += 1
+            if self.overlay:
+                self._draw_overlay(now)
+        for column in range(len(row)):
+            row[column] = 0.0
+        self.last_frame = perf_counter() # the overlay isn't part of a frame
+
+    def _draw_overlay(self, now):
+        """Draw the statistics over the finished frame and update them."""
+        if now >= self.overlay_refresh: # re-render a few times a second
+            self.overlay_refresh = now + 0.25
+            row = self.row
+            text = (f"frame {row[0] * 1000:.2f} ms  fps {1 / row[0]:.0f}  "
+                f"p99 {self.percentile(0.99) * 1000:.1f} ms  "
+                f"input p99 {self.ai_game.controls.percentile(0.99) * 1000:.1f} ms  "
+                f"aliens {row[-2]:.0f}  bullets {row[-1]:.0f}")
+            font = self.ai_game.fonts.get_font("couriernew", 20) # fixed width
+            self.overlay_image = font.render(text, True, (255, 255, 255),
+                (0, 0, 0))
+        screen = self.ai_game.screen
+        rect = self.overlay_image.get_rect()
+        rect.bottomleft = self.ai_game.screen_rect.bottomleft
+        if self.overlay_rect and not rect.contains(self.overlay_rect):
+            # Black out a longer previous text the frame didn't redraw.
+            screen.fill((0, 0, 0), self.overlay_rect)
+            rect = rect.union(self.overlay_rect)
+        screen.blit(self.overlay_image, self.overlay_image.get_rect(
+            bottomleft=rect.bottomleft))
+        self.overlay_rect = rect
+        pygame.display.update(rect) # show it on top of the frame
@@ -0,0 +1,41 @@
+class GameState:
+    """A class to track the state of the game and time its transitions."""
+
+    # States the game can be in.
+    PLAYING = 'playing' # ship, bullets and fleet are moving
+    RESPAWN_PAUSE = 'respawn pause' # short pause after the ship is hit
+    LEVEL_TRANSITION = 'level transition' # short pause after a level is cleared
+    GAME_OVER = 'game over' # waiting for the Play button
+
+    def __init__(self):
+        """Start in the game over state, waiting for the Play button."""
+        self.state = self.GAME_OVER # current state
+        self.next_state = None # state to move to when the timer runs out
+        self.time_left = 0.0 # seconds until the timed transition
+
+    def set(self, state, duration=None, next_state=PLAYING):
+        """Enter state, moving on to next_state after duration seconds."""
+        self.state = state # current state
+        if duration is None:
+            self.next_state = None # stay until told otherwise
+        else:
+            self.next_state = next_state # state once the timer runs out
+            self.time_left = duration
+
+    def update(self, elapsed):
+        """Advance the timer by elapsed seconds, moving on when it runs out."""
+        if self.next_state is None:
+            return # no timed transition pending
+        self.time_left -= elapsed
+        if self.time_left <= 0: # timer ran out
+            self.set(self.next_state)
+
+    @property
+    def game_active(self):
+        """True from pressing Play until the last ship is lost."""
+        return self.state != self.GAME_OVER
+
+    @property
+    def playing(self):
+        """True while the ship, bullets and fleet should move."""
+        return self.state == self.PLAYING
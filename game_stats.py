@@ -1,3 +1,5 @@
+from game_state import GameState
+
 class GameStats:
     """Track statistics for Alien Invasion."""
     
@@ -7,6 +9,7 @@ class GameStats:
         self.reset_stats() # Initialize statistics that can change during the game.
 
         # Start game in an inactive state.
+        self.state = GameState() # current state and timed transitions
         self.game_active = False
 
         # High score should never be reset.
@@ -16,4 +19,14 @@ class GameStats:
         """Initialize statistics that can change during the game."""
         self.ships_left = self.settings.ship_limit # set lives based on settings
         self.score = 0 # set score to initially be 0
-        self.level = 1 # set initial level to 1
\ No newline at end of file
+        self.level = 1 # set initial level to 1
+
+    @property
+    def game_active(self):
+        """True unless the game is over, including during pauses."""
+        return self.state.game_active
+
+    @game_active.setter
+    def game_active(self, active):
+        # Starting or ending a game moves to the playing or game over state.
+        self.state.set(GameState.PLAYING if active else GameState.GAME_OVER)
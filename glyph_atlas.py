@@ -0,0 +1,25 @@
+import pygame
+
+class GlyphAtlas:
+    """A class to draw numbers from glyphs rendered once per font and color."""
+
+    def __init__(self, font, text_color, bg_color, chars="0123456789,"):
+        """Render each character in chars once."""
+        self.bg_color = bg_color # color behind the glyphs
+        # One rendered image per character.
+        self.glyphs = {char: font.render(char, True, text_color, bg_color)
+            for char in chars}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def render(self, text):
+        """Return an image of text, composed from the rendered glyphs."""
+        glyphs = [self.glyphs[char] for char in text] # glyph for each char
+        width = sum(glyph.get_width() for glyph in glyphs) # total text width
+        image = pygame.Surface((width, self.height)) # new image to compose on
+        image.fill(self.bg_color) # paint image to bg_color
+
+        x = 0 # left edge of the next glyph
+        for glyph in glyphs: # place glyphs side by side
+            image.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return image
@@ -0,0 +1,55 @@
+import random
+
+import numpy as np
+import pygame
+
+
+class Pilot:
+    """A class to play the game with a simple scripted policy.
+
+    Each tick the pilot steers toward the lowest living alien and fires
+    while under it. Where exactly it aims and how eagerly it fires are
+    drawn from its own random generator, so pilots with different seeds
+    play different games while each seed plays the same game every time.
+    """
+
+    def __init__(self, ai_game, seed=None, fire_rate=0.5):
+        """Initialize a pilot for ai_game."""
+        self.ai_game = ai_game # game being played
+        self.random = random.Random(seed) # aim and trigger decisions
+        self.fire_rate = fire_rate # chance of firing on a tick under the target
+        self.target = None # slot of the alien being chased
+        self.offset = 0.0 # where under the target the pilot aims
+
+    def events(self):
+        """Return the input events for this tick."""
+        ai_game = self.ai_game
+        fleet = ai_game.aliens
+        ship = ai_game.ship
+        if not fleet:
+            return []
+
+        if self.target is None or not fleet.alive[self.target]:
+            # Chase the lowest living alien, the nearest one on a tie.
+            slots = np.flatnonzero(fleet.alive)
+            lowest = slots[fleet.y[slots] == fleet.y[slots].max()]
+            distance = np.abs(fleet.x[lowest] - ship.x)
+            self.target = int(lowest[distance.argmin()])
+            self.offset = self.random.uniform(-0.4, 0.4) * fleet.width
+
+        # Horizontal distance from the ship's center to the aim point.
+        aim = fleet.x[self.target] + fleet.width / 2 + self.offset
+        distance = aim - ship.rect.centerx
+        slack = ai_game.settings.ship_speed # close enough not to move
+
+        events = []
+        right, left = distance > slack, distance < -slack # directions wanted
+        if right != ship.moving_right:
+            events.append(pygame.event.Event(
+                pygame.KEYDOWN if right else pygame.KEYUP, key=pygame.K_RIGHT))
+        if left != ship.moving_left:
+            events.append(pygame.event.Event(
+                pygame.KEYDOWN if left else pygame.KEYUP, key=pygame.K_LEFT))
+        if abs(distance) < fleet.width / 2 and self.random.random() < self.fire_rate:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        return events
@@ -0,0 +1,102 @@
+import pygame
+
+class DirtyRectRenderer:
+    """A class to redraw and update only the parts of the screen that changed.
+
+    Each frame the rects the ship, bullets and aliens covered on the
+    previous frame are cleared, everything that moves is drawn again, and
+    the scoreboard and Play button are redrawn only where they were touched
+    or have changed. Only those rects are pushed to the display. The whole
+    screen is redrawn when the fleet is rebuilt or the game starts or ends.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize the renderer for ai_game's screen."""
+        self.ai_game = ai_game # game being drawn
+        self.screen = ai_game.screen # initialize screen
+        self.screen_rect = ai_game.screen_rect # reference to screen rect
+        self.settings = ai_game.settings # initialize settings
+
+        self.moving_rects = [] # rects of moving objects drawn last frame
+        self.hud_items = [] # scoreboard images drawn last frame
+        self.state = None # fleet and game state drawn last frame
+
+    def update_screen(self):
+        """Redraw the parts of the screen that changed and update them."""
+        ai_game = self.ai_game
+        # Fleet rebuilds and game state changes redraw everything.
+        state = (ai_game.aliens.generation, ai_game.stats.game_active)
+        if state != self.state:
+            self.state = state # remember what the full redraw showed
+            self._redraw_all()
+            return
+
+        hud_items = self._hud() # scoreboard images to show
+        hud_changed = hud_items != self.hud_items # a score image was replaced
+        moving_rects = self._moving_rects() # where objects are drawn now
+
+        # Images with transparent pixels can't be drawn over themselves, so
+        # scoreboard images in the way are cleared and redrawn completely.
+        touched = self.moving_rects + moving_rects # old and new positions
+        if hud_changed:
+            touched = touched + [rect for image, rect in self.hud_items]
+            redrawn = hud_items # every scoreboard image
+        else:
+            redrawn = [(image, rect) for image, rect in hud_items
+                if rect.collidelist(touched) != -1]
+
+        # Clear everything that moved, and the scoreboard images to redraw.
+        cleared = self.moving_rects + [rect for image, rect in redrawn]
+        if hud_changed:
+            cleared = cleared + [rect for image, rect in self.hud_items]
+        for rect in cleared: # paint old positions to bg_color
+            self.screen.fill(self.settings.bg_color, rect)
+
+        # Draw the moving objects at their new positions.
+        ai_game.ship.blitme() # Draw the ship at its current location.
+        for bullet in ai_game.bullets.sprites(): # traverse list of bullets
+            bullet.draw_bullet() # Draw the bullet to the screen.
+        ai_game.aliens.draw(self.screen) # draw aliens to screen
+
+        # Draw the scoreboard images on top again.
+        for image, rect in redrawn:
+            self.screen.blit(image, rect)
+
+        # Draw the play button again if the game is inactive.
+        dirty = cleared + moving_rects # rects whose pixels may have changed
+        button = ai_game.play_button # drawn over everything else
+        if not ai_game.stats.game_active and button.rect.collidelist(dirty) != -1:
+            button.draw_button() # draw play button
+
+        self.moving_rects = moving_rects # remember what was drawn
+        self.hud_items = hud_items
+        pygame.display.update(dirty) # Update only the changed areas
+
+    def invalidate(self):
+        """Redraw the whole screen next frame, e.g. after it was uncovered."""
+        self.state = None # matches no drawn state
+
+    def _redraw_all(self):
+        """Redraw and update the whole screen."""
+        self.ai_game._draw_screen() # draw every object
+        pygame.display.flip() # Update the full display Surface to the screen
+        self.moving_rects = self._moving_rects() # where objects were drawn
+        self.hud_items = self._hud() # scoreboard images that were drawn
+
+    def _moving_rects(self):
+        """Return the rects of the ship, bullets and aliens."""
+        ai_game = self.ai_game
+        rects = [ai_game.ship.rect] # ship's current rect
+        rects.extend(bullet.rect for bullet in ai_game.bullets.sprites())
+        rects.extend(ai_game.aliens.rects()) # each living alien
+        # Clip to the screen, since fill() shifts rects that stick out of it.
+        return [rect.clip(self.screen_rect) for rect in rects]
+
+    def _hud(self):
+        """Return the scoreboard images with their rects."""
+        sb = self.ai_game.sb # scoreboard being drawn
+        items = [(sb.score_image, sb.score_rect.copy()),
+            (sb.high_score_image, sb.high_score_rect.copy()),
+            (sb.level_image, sb.level_rect.copy()),
+            (sb.ships_image, sb.ships_rect.copy())]
+        return items
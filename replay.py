@@ -0,0 +1,138 @@
+import json
+import random
+import struct
+
+import pygame
+
+# File layout: a header, one record per tick, then the final statistics.
+MAGIC = b'AIRC' # marks an input recording
+VERSION = 1 # bumped whenever the layout changes
+HEADER = struct.Struct('<4sHQHHI') # magic, version, seed, width, height, settings size
+TICK = struct.Struct('<H') # event count, with NEW_ELAPSED set if a time follows
+ELAPSED = struct.Struct('<d') # seconds the tick stood for
+KEY = struct.Struct('<BI') # event code, key
+CLICK = struct.Struct('<Bhh') # event code, mouse x, mouse y
+QUIT = struct.Struct('<B') # event code
+FINAL = struct.Struct('<qII') # score, level, ships_left
+
+NEW_ELAPSED = 0x8000 # tick flag: elapsed differs from the previous tick
+END = 0xFFFF # tick count marking the end of the ticks
+
+# Event types that are recorded, and their codes in the file.
+EVENT_CODES = {pygame.QUIT: 0, pygame.KEYDOWN: 1, pygame.KEYUP: 2,
+    pygame.MOUSEBUTTONDOWN: 3}
+EVENT_TYPES = {code: event_type for event_type, code in EVENT_CODES.items()}
+
+
+class InputRecorder:
+    """A class to record the input of every tick to a compact binary file.
+
+    The file starts with the RNG seed, world size and a snapshot of the
+    settings, so the game can be replayed exactly, and ends with the final
+    statistics so a replay can check it reached the same result.
+    """
+
+    def __init__(self, path, ai_game, seed=None):
+        """Start a recording of ai_game at path."""
+        self.stats = ai_game.stats # statistics written at the end
+        self.file = open(path, 'wb')
+        self.elapsed = None # elapsed time of the previous tick
+
+        if seed is None:
+            seed = random.getrandbits(63) # fresh seed for this game
+        random.seed(seed) # replays seed the RNG the same way
+
+        settings = json.dumps(vars(ai_game.settings)).encode() # settings snapshot
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed,
+            ai_game.screen_rect.width, ai_game.screen_rect.height,
+            len(settings)))
+        self.file.write(settings)
+
+    def record_tick(self, events, elapsed):
+        """Record the events handled on a tick and the time it stood for."""
+        data = [] # encoded events
+        for event in events:
+            code = EVENT_CODES.get(event.type)
+            if code is None:
+                continue # the game ignores this event
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                data.append(CLICK.pack(code, *event.pos))
+            elif event.type == pygame.QUIT:
+                data.append(QUIT.pack(code))
+            else:
+                data.append(KEY.pack(code, event.key))
+
+        count = len(data) # number of events recorded this tick
+        if elapsed != self.elapsed: # time only stored when it changes
+            self.file.write(TICK.pack(count | NEW_ELAPSED))
+            self.file.write(ELAPSED.pack(elapsed))
+            self.elapsed = elapsed
+        else:
+            self.file.write(TICK.pack(count))
+        self.file.write(b''.join(data))
+
+    def close(self):
+        """End the recording with the final statistics."""
+        self.file.write(TICK.pack(END))
+        self.file.write(FINAL.pack(self.stats.score, self.stats.level,
+            self.stats.ships_left))
+        self.file.close()
+
+
+class Recording:
+    """A class to read back a recording made by InputRecorder."""
+
+    def __init__(self, path):
+        """Read the recording at path."""
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        magic, version, self.seed, width, height, settings_size = (
+            HEADER.unpack_from(data))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} recording")
+        self.size = (width, height) # world size the game was played in
+        offset = HEADER.size
+        self.settings = json.loads(data[offset:offset + settings_size])
+        offset += settings_size
+
+        self.ticks = [] # (events, elapsed) for every tick
+        self.final = None # (score, level, ships_left), if the game ended cleanly
+        elapsed = 0.0 # elapsed time of the previous tick
+        while offset < len(data):
+            count, = TICK.unpack_from(data, offset)
+            offset += TICK.size
+            if count == END:
+                self.final = FINAL.unpack_from(data, offset)
+                break
+            if count & NEW_ELAPSED:
+                elapsed, = ELAPSED.unpack_from(data, offset)
+                offset += ELAPSED.size
+                count &= ~NEW_ELAPSED
+
+            events = [] # events handled on this tick
+            for _ in range(count):
+                event_type = EVENT_TYPES[data[offset]]
+                if event_type == pygame.MOUSEBUTTONDOWN:
+                    _, x, y = CLICK.unpack_from(data, offset)
+                    events.append(pygame.event.Event(event_type, pos=(x, y),
+                        button=1))
+                    offset += CLICK.size
+                elif event_type == pygame.QUIT:
+                    events.append(pygame.event.Event(event_type))
+                    offset += QUIT.size
+                else:
+                    _, key = KEY.unpack_from(data, offset)
+                    events.append(pygame.event.Event(event_type, key=key))
+                    offset += KEY.size
+            self.ticks.append((events, elapsed))
+
+    def apply(self, settings):
+        """Restore the recorded settings, before a game is built from them."""
+        for name, value in self.settings.items():
+            # JSON turns the color tuples into lists.
+            setattr(settings, name, tuple(value) if isinstance(value, list) else value)
+
+    def seed_random(self):
+        """Seed the RNG the way the recorded game was."""
+        random.seed(self.seed)
@@ -0,0 +1,90 @@
+import json
+import sqlite3
+import time
+
+from batch_writer import BatchWriter
+
+class ScoreStore:
+    """A class to keep every finished game in a SQLite database.
+
+    Games are queued and written in batches by a background thread, so
+    saving one never stalls the frame loop. The database runs in WAL mode
+    so the game can read while the writer commits, and indexes on score
+    and on (level, score) answer the high score, top-k and per-level
+    queries without reading the whole history.
+    """
+
+    def __init__(self, path, batch_size=256):
+        """Open or create the database at path and start the writer."""
+        self.path = path # database file
+
+        # Reads happen on the caller's thread, on their own connection.
+        self.connection = self._connect()
+        with self.connection:
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS games (
+                id INTEGER PRIMARY KEY,
+                score INTEGER NOT NULL,
+                level INTEGER NOT NULL,
+                played_at REAL NOT NULL,
+                settings TEXT NOT NULL)""")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS games_score ON games (score)")
+            self.connection.execute("""CREATE INDEX IF NOT EXISTS
+                games_level_score ON games (level, score)""")
+
+        self.write_connection = None # the writer's own connection
+        self.writer = BatchWriter("score writer", self._write_games,
+            start=self._open_writer, finish=self._close_writer,
+            batch_size=batch_size) # writes queued games, one transaction each
+
+    def record(self, score, level, settings):
+        """Queue a finished game to be saved, without waiting for the write."""
+        self.writer.put((score, level, time.time(),
+            json.dumps(vars(settings), sort_keys=True)))
+
+    def high_score(self):
+        """Return the highest score ever recorded, or 0."""
+        # MAX over an indexed column only reads the end of the index.
+        row = self.connection.execute("SELECT MAX(score) FROM games").fetchone()
+        return row[0] or 0
+
+    def top_scores(self, k=10, level=None):
+        """Return up to k (score, level, played_at) rows, best first.
+
+        With level set only games that ended on that level are included.
+        """
+        if level is None:
+            return self.connection.execute("""SELECT score, level, played_at
+                FROM games ORDER BY score DESC LIMIT ?""", (k,)).fetchall()
+        return self.connection.execute("""SELECT score, level, played_at
+            FROM games WHERE level = ? ORDER BY score DESC LIMIT ?""",
+            (level, k)).fetchall()
+
+    def close(self):
+        """Write any queued games, then stop the writer and close."""
+        self.writer.close()
+        self.connection.close()
+
+    def _connect(self):
+        """Return a new connection to the database in WAL mode."""
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL") # readers don't block writers
+        connection.execute("PRAGMA synchronous=NORMAL") # fsync at checkpoints only
+        return connection
+
+    def _open_writer(self):
+        """Open the writer's own connection, on the writer thread."""
+        self.write_connection = self._connect()
+
+    def _write_games(self, batch, last):
+        """Write a batch of queued games in one transaction."""
+        if batch:
+            with self.write_connection:
+                self.write_connection.executemany("""INSERT INTO games
+                    (score, level, played_at, settings)
+                    VALUES (?, ?, ?, ?)""", batch)
+
+    def _close_writer(self):
+        """Close the writer's connection, on the writer thread."""
+        if self.write_connection is not None:
+            self.write_connection.close()
@@ -1,7 +1,6 @@
 import pygame.font
-from pygame.sprite import Group
  
-from ship import Ship
+from glyph_atlas import GlyphAtlas
 
 class Scoreboard:
     """A class to report scoring information."""
@@ -10,13 +9,19 @@ class Scoreboard:
         """Initialize scorekeeping attributes."""
         self.ai_game = ai_game # initialize game AI
         self.screen = ai_game.screen # initialize game screen
-        self.screen_rect = self.screen.get_rect() # init game coordinates
+        self.screen_rect = ai_game.screen_rect # init game coordinates
+        self.headless = ai_game.headless # nothing is rendered when headless
         self.settings = ai_game.settings # init game settings
         self.stats = ai_game.stats # initialize game stats
         
         # Font settings for scoring information.
         self.text_color = (42,245,255) # set scoreboard text color (bluish)
-        self.font = pygame.font.SysFont("comicsansms", 48) # set font size
+        if not self.headless: # fonts are only needed to render
+            self.font = ai_game.fonts.get_font("comicsansms", 48) # set font size
+            # Render digits and commas once, and compose numbers from them.
+            self.digits = GlyphAtlas(self.font, self.text_color,
+                self.settings.bg_color)
+            self._prep_ships_strip() # images of all ships(lives)
 
         # Prepare the initial score images.
         self.prep_score() # Turn the score into a rendered image.
@@ -26,11 +31,12 @@ class Scoreboard:
 
     def prep_score(self):
         """Turn the score into a rendered image."""
+        if self.headless: # no images without a display
+            return
         rounded_score = round(self.stats.score, -1) # rounds removing one decimal point
         score_str = "{:,}".format(rounded_score) # format score and set as string
         # draw score to screen
-        self.score_image = self.font.render(score_str, True,
-                self.text_color, self.settings.bg_color)
+        self.score_image = self.digits.render(score_str)
         
         # Display the score at the top right of the screen.
         self.score_rect = self.score_image.get_rect() # Set score coordinates
@@ -40,11 +46,12 @@ class Scoreboard:
 
     def prep_high_score(self):
         """Turn the high score into a rendered image."""
+        if self.headless: # no images without a display
+            return
         high_score = round(self.stats.high_score, -1) # rounds removing one decimal point
         high_score_str = "{:,}".format(high_score) # format high_score and set as string
         # draw high_score to screen
-        self.high_score_image = self.font.render(high_score_str, True,
-                self.text_color, self.settings.bg_color)
+        self.high_score_image = self.digits.render(high_score_str)
             
         # Center the high score at the top of the screen.
         self.high_score_rect = self.high_score_image.get_rect()  # Set score coordinates
@@ -53,10 +60,11 @@ class Scoreboard:
 
     def prep_level(self):
         """Turn the level into a rendered image."""
+        if self.headless: # no images without a display
+            return
         level_str = str(self.stats.level) # string representing level num
         # draw string to screen for level number
-        self.level_image = self.font.render(level_str, True,
-                self.text_color, self.settings.bg_color)
+        self.level_image = self.digits.render(level_str)
     
         # Position the level below the score.
         self.level_rect = self.level_image.get_rect() # set coordinates
@@ -65,13 +73,26 @@ class Scoreboard:
 
     def prep_ships(self):
         """Show how many ships are left."""
-        self.ships = Group() # A container class to hold and manage multiple Sprite objects.
-        for ship_number in range(self.stats.ships_left): # each ship(life) still left
-            ship = Ship(self.ai_game) # instantiate ship
-            # draw next ship (life) image 
-            ship.rect.x = 10 + ship_number * ship.rect.width 
-            ship.rect.y = 10 # set ship 10 px from top
-            self.ships.add(ship) # add ship to ships
+        if self.headless: # no images without a display
+            return
+        ships_width = self.stats.ships_left * self.ship_width # one ship per life
+        # Show the part of the strip holding the ships still left.
+        self.ships_image = self.ships_strip.subsurface(
+            (0, 0, ships_width, self.ships_strip.get_height()))
+        self.ships_rect = self.ships_image.get_rect() # set coordinates
+        self.ships_rect.topleft = (10, 10) # set ships 10 px from top left
+
+    def _prep_ships_strip(self):
+        """Draw the ship image once for every life into a single strip."""
+        image = self.ai_game.assets.load_image('images/ship.bmp') # ship(life) image
+        self.ship_width, ship_height = image.get_size() # size of one ship
+        self.ships_strip = pygame.Surface(
+            (self.settings.ship_limit * self.ship_width, ship_height),
+            pygame.SRCALPHA) # transparent strip
+        for ship_number in range(self.settings.ship_limit): # each ship(life)
+            # Copy the pixels, alpha included, instead of blending them.
+            self.ships_strip.blit(image, (ship_number * self.ship_width, 0),
+                special_flags=pygame.BLEND_RGBA_MAX)
 
     def check_high_score(self):
         """Check to see if there's a new high score."""
@@ -84,4 +105,4 @@ class Scoreboard:
         self.screen.blit(self.score_image, self.score_rect) # draw score
         self.screen.blit(self.high_score_image, self.high_score_rect) # draw high score
         self.screen.blit(self.level_image, self.level_rect) # draw level number
-        self.ships.draw(self.screen) # draw ships(lives)
+        self.screen.blit(self.ships_image, self.ships_rect) # draw ships(lives)
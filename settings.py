@@ -7,6 +7,53 @@ class Settings:
         self.screen_width = 1200 # set game width to 1200 px
         self.screen_height = 800 # set game height to 800 px
         self.bg_color = (45, 45, 45) # set game Background-color to nearly white
+        self.dirty_rects = False # redraw only the parts of the screen that changed
+        self.fleet_surface = True # draw the fleet from pre-composited rows
+
+        # Draw at screen_width x screen_height times render_scale, and let
+        # SDL scale that to the display, instead of at the display's size.
+        # The logical size decides the fleet, so gameplay follows it.
+        self.scaled = False # fixed logical resolution
+        self.render_scale = 1.0 # logical size relative to the screen size
+        self.windowed = False # scaled into a window rather than fullscreen
+
+        # Startup settings
+        self.font_cache = 'font_cache.json' # file remembering where fonts are
+        self.report_startup = False # print time spent starting the game and image cache use
+
+        # Control settings: pygame key names (K_ constants without the
+        # prefix) bound to the actions the game understands.
+        self.key_bindings = {
+            'RIGHT': 'move_right', # hold to move the ship right
+            'LEFT': 'move_left', # hold to move the ship left
+            'SPACE': 'fire', # fire a bullet
+            'q': 'quit', # exit the game
+            'F3': 'frame_overlay', # show or hide frame times
+            'F5': 'profile', # start or save a cProfile capture
+            'F6': 'save_snapshot', # save the game to snapshot_path
+            'F7': 'load_snapshot', # resume the game saved with F6
+        }
+        self.report_latency = False # print input-to-display latency on exit
+
+        # Profiling settings
+        self.frame_stats = False # time each phase of every frame
+        self.frame_stats_path = 'frame_stats' # exported to .csv and .json, None to not export
+        self.frame_profile = 'frame.prof' # file F5 saves a cProfile capture to
+
+        # Score settings
+        self.score_db = 'scores.db' # database of every finished game, None to not save
+        self.telemetry_dir = None # directory for gameplay event logs, None to not log
+        self.snapshot_path = 'snapshot.bin' # file F6 saves the game to and F7 loads
+
+        # Timing settings
+        self.tick_rate = 240 # simulated ticks per second, whatever the frame rate
+        self.fps_cap = 144 # most frames drawn per second, 0 for no cap
+        self.vsync = False # wait for the display's refresh to show each frame
+        self.respawn_pause = 0.5 # seconds to pause after the ship is hit
+        self.level_pause = 0.0 # seconds to pause after a level is cleared
+
+        # Collision settings
+        self.pixel_collisions = True # only solid pixels collide, not whole rects
 
         # Ship settings
         self.ship_limit = 3 # number of lives
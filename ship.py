@@ -1,5 +1,3 @@
-import pygame
- 
 from pygame.sprite import Sprite
  
 class Ship(Sprite):
@@ -10,11 +8,14 @@ class Ship(Sprite):
         super().__init__()
         self.screen = ai_game.screen # initialize screen
         self.settings = ai_game.settings # initialize settings
-        self.screen_rect = ai_game.screen.get_rect() # reference to rect for ship
+        self.screen_rect = ai_game.screen_rect # reference to rect for ship
 
         # Load the ship image and get its rect.
-        self.image = pygame.image.load('images/ship.bmp') # image of ship
+        self.image = ai_game.assets.load_image('images/ship.bmp') # image of ship
         self.rect = self.image.get_rect() # get rect to load image
+        # Solid pixels of the ship, when collisions are pixel accurate.
+        self.mask = (ai_game.assets.load_mask('images/ship.bmp')
+            if self.settings.pixel_collisions else None)
 
         # Start each new ship at the bottom center of the screen.
         self.rect.midbottom = self.screen_rect.midbottom
@@ -0,0 +1,168 @@
+import struct
+
+import numpy as np
+import pygame
+
+from game_state import GameState
+
+# File layout: header, game state, dynamic settings, ship, bullets, fleet.
+MAGIC = b'AISN' # marks a game snapshot
+VERSION = 2 # bumped whenever the layout changes
+HEADER = struct.Struct('<4sHHH') # magic, version, width, height
+STATE = struct.Struct('<qqIIBBd') # score, high score, level, ships left,
+                                  # state, next state, time left
+SETTINGS = struct.Struct('<dddbq') # ship, bullet and alien speeds,
+                                   # fleet direction, alien points
+SHIP = struct.Struct('<d??') # x, moving right, moving left
+COUNT = struct.Struct('<I') # number of bullets
+BULLET = struct.Struct('<id') # rect.x, y
+FLEET = struct.Struct('<IHH') # number of slots, grid columns, grid rows
+
+# Game states and their codes in the file; NO_STATE means no timer.
+STATES = (GameState.PLAYING, GameState.RESPAWN_PAUSE,
+    GameState.LEVEL_TRANSITION, GameState.GAME_OVER)
+NO_STATE = 255
+
+
+def take_snapshot(ai_game):
+    """Return the full state of ai_game as bytes."""
+    stats, settings, ship = ai_game.stats, ai_game.settings, ai_game.ship
+    state = stats.state # current state and timed transition
+    next_state = (NO_STATE if state.next_state is None
+        else STATES.index(state.next_state))
+    fleet = ai_game.aliens
+    grid = fleet.index.grid or (0, 0) # 0 columns: not in formation
+
+    parts = [
+        HEADER.pack(MAGIC, VERSION, ai_game.screen_rect.width,
+            ai_game.screen_rect.height),
+        STATE.pack(stats.score, stats.high_score, stats.level,
+            stats.ships_left, STATES.index(state.state), next_state,
+            state.time_left),
+        SETTINGS.pack(settings.ship_speed, settings.bullet_speed,
+            settings.alien_speed, settings.fleet_direction,
+            settings.alien_points),
+        SHIP.pack(ship.x, ship.moving_right, ship.moving_left),
+        COUNT.pack(len(ai_game.bullets)),
+    ]
+    parts.extend(BULLET.pack(bullet.rect.x, bullet.y)
+        for bullet in ai_game.bullets)
+    # The fleet's arrays are copied as they are, without a loop.
+    parts.append(FLEET.pack(len(fleet.x), *grid))
+    parts.append(fleet.x.astype('<f8').tobytes())
+    parts.append(fleet.y.astype('<i8').tobytes())
+    parts.append(fleet.alive.tobytes())
+    return b''.join(parts)
+
+
+def restore_snapshot(ai_game, data):
+    """Put ai_game back into the state saved in data by take_snapshot.
+
+    Raises ValueError if data isn't a whole snapshot of a game this size;
+    the game is only changed once all of data has been read.
+    """
+    (score, high_score, level, ships_left, state, next_state, time_left,
+        speeds, ship_state, bullets, fleet) = _parse(ai_game, data)
+
+    stats = ai_game.stats
+    stats.score, stats.high_score = score, high_score
+    stats.level, stats.ships_left = level, ships_left
+    stats.state.state = state
+    stats.state.next_state = next_state
+    stats.state.time_left = time_left
+
+    settings = ai_game.settings
+    (settings.ship_speed, settings.bullet_speed, settings.alien_speed,
+        settings.fleet_direction, settings.alien_points) = speeds
+
+    ship = ai_game.ship
+    ship.x, ship.moving_right, ship.moving_left = ship_state
+    ship.rect.x = ship.x # Update rect object from self.x.
+
+    # Bullets come from the pool, so none are made if it's big enough.
+    ai_game.bullets.empty()
+    for x, y in bullets:
+        bullet = ai_game.bullets.fire()
+        bullet.rect.x, bullet.y = x, y
+        bullet.rect.y = y
+
+    # The fleet keeps its image, masks and alien handles.
+    x, y, alive, grid = fleet
+    ai_game.aliens.set_positions(x, y, alive, grid=grid)
+
+    # Show the restored scores, level and ships.
+    sb = ai_game.sb
+    sb.prep_score()
+    sb.prep_high_score()
+    sb.prep_level()
+    sb.prep_ships()
+    if not ai_game.headless: # cursor only shown while waiting for Play
+        pygame.mouse.set_visible(not stats.game_active)
+
+
+def save_snapshot(ai_game, path):
+    """Write a snapshot of ai_game to the file at path."""
+    with open(path, 'wb') as f:
+        f.write(take_snapshot(ai_game))
+
+
+def load_snapshot(ai_game, path):
+    """Restore ai_game from the snapshot file at path."""
+    with open(path, 'rb') as f:
+        restore_snapshot(ai_game, f.read())
+
+
+def _parse(ai_game, data):
+    """Return every section of snapshot data, checked against ai_game.
+
+    Raises ValueError if data is short, corrupt or of another game size.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("snapshot is truncated")
+    magic, version, width, height = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} snapshot")
+    if (width, height) != ai_game.screen_rect.size:
+        raise ValueError(f"snapshot is of a {width}x{height} game, "
+            f"not {ai_game.screen_rect.width}x{ai_game.screen_rect.height}")
+
+    offset = HEADER.size
+    fixed = STATE.size + SETTINGS.size + SHIP.size + COUNT.size
+    if len(data) < offset + fixed:
+        raise ValueError("snapshot is truncated")
+    (score, high_score, level, ships_left, state, next_state,
+        time_left) = STATE.unpack_from(data, offset)
+    offset += STATE.size
+    if state >= len(STATES) or (next_state != NO_STATE and
+            next_state >= len(STATES)):
+        raise ValueError("snapshot has an unknown game state")
+    state = STATES[state]
+    next_state = None if next_state == NO_STATE else STATES[next_state]
+    speeds = SETTINGS.unpack_from(data, offset)
+    offset += SETTINGS.size
+    ship_state = SHIP.unpack_from(data, offset)
+    offset += SHIP.size
+
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    end = offset + count * BULLET.size
+    if len(data) < end + FLEET.size:
+        raise ValueError("snapshot is truncated")
+    bullets = list(BULLET.iter_unpack(data[offset:end]))
+    offset = end
+
+    slots, columns, rows = FLEET.unpack_from(data, offset)
+    offset += FLEET.size
+    if columns and columns * rows != slots:
+        raise ValueError("snapshot fleet doesn't match its grid")
+    if len(data) != offset + slots * (8 + 8 + 1): # x, y and alive per slot
+        raise ValueError("snapshot is truncated or has trailing data")
+    x = np.frombuffer(data, '<f8', slots, offset)
+    offset += x.nbytes
+    y = np.frombuffer(data, '<i8', slots, offset)
+    offset += y.nbytes
+    alive = np.frombuffer(data, bool, slots, offset)
+    fleet = (x, y, alive, (columns, rows) if columns else None)
+
+    return (score, high_score, level, ships_left, state, next_state,
+        time_left, speeds, ship_state, bullets, fleet)
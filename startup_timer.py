@@ -0,0 +1,28 @@
+from time import perf_counter
+
+class StartupTimer:
+    """A class to time each phase of starting the game."""
+
+    def __init__(self):
+        """Start timing from now."""
+        self.start = perf_counter() # time startup began
+        self.last = self.start # time the previous phase ended
+        self.phases = [] # (phase name, seconds) in order
+
+    def mark(self, phase):
+        """Record that phase has just finished."""
+        now = perf_counter()
+        self.phases.append((phase, now - self.last)) # time spent in phase
+        self.last = now
+
+    @property
+    def total(self):
+        """Seconds from the start to the end of the last phase."""
+        return self.last - self.start
+
+    def report(self):
+        """Return the time spent in each phase, one per line."""
+        lines = [f"{phase:>14}: {seconds * 1000:8.1f} ms"
+            for phase, seconds in self.phases]
+        lines.append(f"{'total':>14}: {self.total * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,138 @@
+"""Sweep difficulty and scoring settings over many scripted games.
+
+Every combination of the given setting values is a grid point. Each
+grid point is played --games times headless by a scripted Pilot, one
+game per task on a multiprocessing pool. Results stream back as games
+finish and are aggregated per grid point, then written column by column
+to a NumPy .npz file.
+
+    python sweep.py --speedup-scale 1.2,1.4,1.6 --bullets-allowed 3,5 --games 20
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import sys
+from time import perf_counter
+
+import numpy as np
+
+# Settings that can be swept, and the type of their values.
+PARAMETERS = {
+    'speedup_scale': float,
+    'score_scale': float,
+    'alien_speed': float,
+    'fleet_drop_speed': int,
+    'bullets_allowed': int,
+}
+# Settings reset by initialize_dynamic_settings when a game starts.
+DYNAMIC = {'alien_speed'}
+
+
+def play(task):
+    """Play one game for task and return its grid point and results."""
+    # Imported here so the parent process never loads pygame.
+    from alien_invasion import AlienInvasion
+    from pilot import Pilot
+    from settings import Settings
+
+    point, values, seed, max_seconds = task
+    settings = Settings()
+    for name, value in values.items():
+        if name not in DYNAMIC:
+            setattr(settings, name, value)
+    ai = AlienInvasion(headless=True, settings=settings)
+    ai._start_game() # skip the Play button
+    for name, value in values.items():
+        if name in DYNAMIC: # set again after the game reset them
+            setattr(settings, name, value)
+
+    pilot = Pilot(ai, seed)
+    ticks = 0 # ticks played
+    max_ticks = int(max_seconds * settings.tick_rate) # games are cut off here
+    while ai.stats.game_active and ticks < max_ticks:
+        ai.step(pilot.events())
+        ticks += 1
+    return (point, ai.stats.score, ai.stats.level, ticks / settings.tick_rate,
+        not ai.stats.game_active)
+
+
+def grid(args):
+    """Return the names and every combination of the values to sweep."""
+    names = [name for name in PARAMETERS if getattr(args, name) is not None]
+    values = [[PARAMETERS[name](value) for value in getattr(args, name).split(',')]
+        for name in names]
+    return names, list(itertools.product(*values))
+
+
+def sweep(names, points, games, max_seconds, processes=None, seed=0):
+    """Play games per grid point on a pool and return the results by column."""
+    tasks = [(point, dict(zip(names, values)), seed + point * games + game,
+        max_seconds) for point, values in enumerate(points)
+        for game in range(games)]
+
+    columns = {'point': [], 'score': [], 'level': [], 'survival': [], 'ended': []}
+    start = perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        # Games take very different times, so hand them out one at a time.
+        for done, result in enumerate(pool.imap_unordered(play, tasks), 1):
+            for column, value in zip(columns.values(), result):
+                column.append(value)
+            print(f"\r{done}/{len(tasks)} games, "
+                f"{perf_counter() - start:.1f} s", end='', file=sys.stderr)
+    print(file=sys.stderr)
+    return {name: np.array(column) for name, column in columns.items()}
+
+
+def aggregate(names, points, games):
+    """Return per grid point statistics of the games, by column."""
+    order = np.argsort(games['point'], kind='stable') # games grouped by point
+    point = games['point'][order]
+    starts = np.searchsorted(point, np.arange(len(points))) # first game of each point
+
+    columns = {name: np.array([values[i] for values in points])
+        for i, name in enumerate(names)}
+    columns['games'] = np.diff(np.append(starts, len(point)))
+    for name in ('score', 'level', 'survival'):
+        values = games[name][order].astype(float)
+        columns[f'{name}_mean'] = np.add.reduceat(values, starts) / columns['games']
+        columns[f'{name}_min'] = np.minimum.reduceat(values, starts)
+        columns[f'{name}_max'] = np.maximum.reduceat(values, starts)
+    columns['ended'] = np.add.reduceat(games['ended'][order], starts)
+    return columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for name, kind in PARAMETERS.items():
+        parser.add_argument('--' + name.replace('_', '-'), metavar='VALUES',
+            help=f"comma-separated {kind.__name__} values of {name}")
+    parser.add_argument('--games', type=int, default=10,
+        help="games per grid point (default 10)")
+    parser.add_argument('--max-seconds', type=float, default=300,
+        help="game time after which a game is cut off (default 300)")
+    parser.add_argument('--processes', type=int,
+        help="worker processes (default one per core)")
+    parser.add_argument('--seed', type=int, default=0,
+        help="seed of the first pilot (default 0)")
+    parser.add_argument('--output', default='sweep.npz',
+        help="file to write the results to (default sweep.npz)")
+    args = parser.parse_args()
+
+    names, points = grid(args)
+    games = sweep(names, points, args.games, args.max_seconds,
+        args.processes, args.seed)
+    columns = aggregate(names, points, games)
+    # Per game columns are kept too, prefixed with game_.
+    columns.update({f'game_{name}': column for name, column in games.items()})
+    np.savez(args.output, **columns)
+
+    for i, values in enumerate(points):
+        setting = " ".join(f"{name}={value}" for name, value in zip(names, values))
+        print(f"{setting or 'defaults'}: score {columns['score_mean'][i]:.0f}, "
+            f"level {columns['level_mean'][i]:.1f}, "
+            f"survival {columns['survival_mean'][i]:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
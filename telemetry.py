@@ -0,0 +1,84 @@
+import gzip
+import itertools
+import json
+import os
+import queue
+import time
+
+from batch_writer import BatchWriter
+
+sessions = itertools.count() # numbers sessions started by this process
+
+class Telemetry:
+    """A class to stream gameplay events to compressed JSONL files.
+
+    emit() puts a compact record on a bounded queue and never blocks: when
+    the queue is full the record is dropped and counted instead. A
+    background thread writes the records in batches, one JSON object per
+    line, to gzip files that are rotated after max_bytes of JSON.
+    """
+
+    def __init__(self, directory, max_events=10000, batch_size=512,
+            max_bytes=16 * 1024 * 1024):
+        """Start a session writing to directory."""
+        os.makedirs(directory, exist_ok=True)
+        self.start = time.perf_counter() # records are timed from here
+        # Files of this session are telemetry-<start>-<pid>-<session>-<part>
+        # .jsonl.gz, in order; sessions started in the same second differ.
+        self.prefix = os.path.join(directory,
+            time.strftime("telemetry-%Y%m%d-%H%M%S") +
+            f"-{os.getpid()}-{next(sessions)}")
+        self.max_bytes = max_bytes # JSON bytes per file before rotating
+        self.dropped = 0 # records lost because the queue was full
+
+        # The current file, only used by the writer thread.
+        self.part = 0 # number of the current file
+        self.file = None # current file
+        self.written = 0 # JSON bytes in the current file
+
+        self.writer = BatchWriter("telemetry writer", self._write_events,
+            start=self._open_first, finish=self._close_file,
+            max_items=max_events, batch_size=batch_size) # writes queued records
+
+    def emit(self, event, **fields):
+        """Queue an event record, dropping it if the writer is behind."""
+        try:
+            self.writer.put_nowait(
+                (time.perf_counter() - self.start, event, fields))
+        except queue.Full:
+            self.dropped += 1 # never wait for the writer
+
+    def close(self):
+        """Write any queued records, then stop the writer."""
+        self.writer.close()
+
+    def _open(self, part):
+        """Open the file for part of the session."""
+        return gzip.open(f"{self.prefix}-{part:03d}.jsonl.gz", 'xt') # never overwrite
+
+    def _open_first(self):
+        """Open the session's first file, on the writer thread."""
+        self.file = self._open(self.part)
+
+    def _write_events(self, batch, last):
+        """Write a batch of records, rotating files after max_bytes."""
+        if last and self.dropped: # say how much is missing
+            batch.append((time.perf_counter() - self.start,
+                'dropped', {'count': self.dropped}))
+        if not batch:
+            return
+        lines = "".join(json.dumps({'t': round(t, 4), 'event': event,
+            **fields}, separators=(',', ':')) + "\n"
+            for t, event, fields in batch)
+        if self.written and self.written + len(lines) > self.max_bytes:
+            self.file.close() # start the next file
+            self.part += 1
+            self.file = self._open(self.part)
+            self.written = 0
+        self.file.write(lines)
+        self.written += len(lines)
+
+    def _close_file(self):
+        """Close the current file, on the writer thread."""
+        if self.file is not None:
+            self.file.close()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The game loads images by relative path and runs without a display.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
@@ -0,0 +1,105 @@
+import random
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+
+
+class Box(pygame.sprite.Sprite):
+    """A plain sprite with only a rect, for pygame's collision functions."""
+
+    def __init__(self, rect):
+        super().__init__()
+        self.rect = pygame.Rect(rect)
+
+
+def test_collide_matches_groupcollide():
+    """The grid and the spatial hash find what groupcollide finds."""
+    settings = Settings()
+    settings.pixel_collisions = False # compare rects, like groupcollide
+    ai = AlienInvasion(headless=True, size=(3840, 2160), settings=settings)
+    fleet = ai.aliens
+    rng = random.Random(5)
+    for trial in range(60):
+        if trial % 2: # formation, indexed as a grid
+            ai._create_fleet()
+        else: # scattered aliens, indexed by the spatial hash
+            count = rng.randint(1, 300)
+            fleet.set_positions([rng.uniform(-100, 3800) for _ in range(count)],
+                [rng.randint(-50, 2100) for _ in range(count)])
+        for _ in range(rng.randint(0, 200)):
+            settings.fleet_direction = rng.choice([1, -1])
+            settings.alien_speed = rng.uniform(0.1, 3)
+            fleet.update()
+            if rng.random() < 0.05:
+                fleet.drop(6)
+        for index in rng.sample(range(len(fleet.x)), len(fleet.x) // 3):
+            fleet.kill(index)
+
+        # The same aliens as plain sprites.
+        reference = pygame.sprite.Group()
+        slots = {} # reference sprite -> fleet slot
+        for alien in fleet.sprites():
+            box = Box(alien.rect)
+            reference.add(box)
+            slots[box] = alien.index
+
+        rects = [(rng.randint(-10, 3850), rng.randint(-40, 2200),
+            rng.choice([4, 120, 1, 300]), rng.choice([30, 104, 1]))
+            for _ in range(60)]
+        for rect in rects:
+            expected = pygame.sprite.spritecollideany(Box(rect), reference)
+            got = fleet.collide_any(pygame.Rect(rect))
+            assert (got and got.index) == slots.get(expected)
+
+        expected = pygame.sprite.groupcollide(
+            pygame.sprite.Group(*[Box(rect) for rect in rects]),
+            reference, True, True)
+        bullets = pygame.sprite.Group(*[Box(rect) for rect in rects])
+        got = fleet.collide(bullets)
+        assert ([(tuple(bullet.rect), [alien.index for alien in aliens])
+            for bullet, aliens in got.items()] ==
+            [(tuple(bullet.rect), [slots[box] for box in boxes])
+            for bullet, boxes in expected.items()])
+        assert len(fleet) == len(reference)
+
+
+def test_pixel_collisions_match_masks():
+    """With pixel collisions, only overlapping solid pixels collide."""
+    ai = AlienInvasion(headless=True)
+    fleet = ai.aliens
+    alien_mask = pygame.mask.from_surface(pygame.image.load('images/alien.bmp'))
+    rng = random.Random(1)
+    hits = 0
+    for trial in range(1000):
+        if trial % 100 == 0:
+            fleet.empty()
+            ai._create_fleet()
+            fleet.x += rng.uniform(0, 40)
+            fleet.drop(rng.randrange(0, 300))
+            for index in rng.sample(range(len(fleet.x)), 10):
+                fleet.kill(index)
+        if rng.random() < 0.5: # a bullet, solid throughout
+            rect = pygame.Rect(rng.randrange(-20, 1220), rng.randrange(-20, 820),
+                4, 30)
+            mask, solid = None, pygame.Mask(rect.size, fill=True)
+        else: # the ship
+            rect = pygame.Rect((rng.randrange(-20, 1220),
+                rng.randrange(-20, 820)), ai.ship.rect.size)
+            mask = solid = ai.ship.mask
+        got = fleet.collide_any(rect, mask)
+
+        expected = None # first living alien whose pixels overlap
+        for index in range(len(fleet.x)):
+            alien_rect = pygame.Rect(0, int(fleet.y[index]), fleet.width,
+                fleet.height)
+            alien_rect.x = fleet.x[index]
+            if (fleet.alive[index] and alien_rect.colliderect(rect) and
+                    alien_mask.overlap(solid, (rect.x - alien_rect.x,
+                    rect.y - alien_rect.y))):
+                expected = index
+                break
+        assert (got.index if got is not None else None) == expected
+        hits += expected is not None
+    assert hits # the trials did collide
@@ -0,0 +1,42 @@
+import pygame
+
+from alien_invasion import AlienInvasion
+from pilot import Pilot
+from replay import Recording
+from settings import Settings
+
+
+def record_game(path, settings, ticks):
+    """Play a headless game with a pilot, recording its input to path."""
+    ai = AlienInvasion(headless=True, settings=settings)
+    ai.start_recording(path, seed=7)
+    pilot = Pilot(ai, seed=3, fire_rate=0.3)
+    click = pygame.event.Event(pygame.MOUSEBUTTONDOWN,
+        pos=ai.play_button.rect.center, button=1) # start from the Play button
+    tick = 1 / settings.tick_rate
+    for number in range(ticks):
+        events = [click] if number == 0 else pilot.events()
+        ai.pending_events.extend(events) # as _check_events keeps them
+        for event in events:
+            ai._handle_event(event)
+        ai._tick(tick)
+        if not ai.stats.game_active:
+            break
+    ai.recorder.close()
+    return ai.stats.score, ai.stats.level, ai.stats.ships_left
+
+
+def test_replay_matches_recording(tmp_path):
+    """A replay reaches exactly the recorded score, level and ships."""
+    path = tmp_path / 'game.rec'
+    settings = Settings()
+    settings.pixel_collisions = False # not the default, so it must be restored
+    final = record_game(path, settings, 20000)
+    assert final[0] > 0 # the pilot scored
+
+    recording = Recording(path)
+    assert recording.final == final
+    ai = AlienInvasion.from_recording(recording, headless=True)
+    assert not ai.settings.pixel_collisions
+    assert ai.aliens.mask is None # built from the recorded settings
+    assert ai.run_replay(recording)
@@ -0,0 +1,41 @@
+from alien_invasion import AlienInvasion
+from score_store import ScoreStore
+from settings import Settings
+
+
+def test_high_score_and_top_scores(tmp_path):
+    """Recorded games are ranked overall and per level."""
+    store = ScoreStore(tmp_path / 'scores.db')
+    settings = Settings()
+    for score, level in [(300, 2), (1200, 4), (50, 1), (900, 4), (400, 2)]:
+        store.record(score, level, settings)
+    store.close() # writes everything queued
+
+    store = ScoreStore(tmp_path / 'scores.db')
+    assert store.high_score() == 1200
+    assert [row[:2] for row in store.top_scores(3)] == [
+        (1200, 4), (900, 4), (400, 2)]
+    assert [row[:2] for row in store.top_scores(level=2)] == [(400, 2), (300, 2)]
+    assert store.top_scores(level=3) == []
+    store.close()
+
+
+def test_last_ship_records_one_game(tmp_path):
+    """Losing the last ship to an alien at the bottom saves the game once."""
+    settings = Settings()
+    settings.pixel_collisions = False
+    ai = AlienInvasion(headless=True, settings=settings)
+    ai.scores = ScoreStore(tmp_path / 'scores.db')
+    ai._start_game()
+    ai.stats.ships_left = 0
+    # One alien over the ship and at the bottom of the screen at once.
+    fleet = ai.aliens
+    fleet.set_positions([ai.ship.rect.centerx - fleet.width / 2],
+        [ai.screen_rect.bottom - fleet.height])
+    ai.step()
+    assert not ai.stats.game_active
+    ai.scores.close()
+
+    store = ScoreStore(tmp_path / 'scores.db')
+    assert len(store.top_scores()) == 1
+    store.close()
@@ -0,0 +1,45 @@
+import pytest
+
+from alien_invasion import AlienInvasion
+from pilot import Pilot
+from snapshot import restore_snapshot, take_snapshot
+
+
+def play(ai, pilot, ticks):
+    """Let pilot play ai for up to ticks ticks."""
+    for _ in range(ticks):
+        if not ai.stats.game_active:
+            break
+        ai.step(pilot.events())
+
+
+def test_snapshot_round_trip():
+    """A restored game is saved the same and plays on the same."""
+    ai = AlienInvasion(headless=True)
+    ai._start_game()
+    play(ai, Pilot(ai, seed=2), 3000)
+    data = take_snapshot(ai)
+
+    other = AlienInvasion(headless=True)
+    restore_snapshot(other, data)
+    assert take_snapshot(other) == data
+
+    # Both games go on identically from the snapshot.
+    play(ai, Pilot(ai, seed=4), 3000)
+    play(other, Pilot(other, seed=4), 3000)
+    assert take_snapshot(other) == take_snapshot(ai)
+
+
+@pytest.mark.parametrize('cut', [0, 10, 60, -1])
+def test_bad_snapshot_changes_nothing(cut):
+    """Truncated snapshots raise ValueError before touching the game."""
+    ai = AlienInvasion(headless=True)
+    ai._start_game()
+    play(ai, Pilot(ai, seed=2), 500)
+    data = take_snapshot(ai)
+
+    other = AlienInvasion(headless=True)
+    before = take_snapshot(other)
+    with pytest.raises(ValueError):
+        restore_snapshot(other, data[:cut])
+    assert take_snapshot(other) == before
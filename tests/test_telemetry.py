@@ -0,0 +1,57 @@
+import glob
+import gzip
+import json
+import os
+
+from telemetry import Telemetry
+
+
+def read_records(directory):
+    """Return the files of directory's session and their records, in order."""
+    files = sorted(glob.glob(os.path.join(directory, 'telemetry-*.jsonl.gz')))
+    records = []
+    for path in files:
+        with gzip.open(path, 'rt') as f:
+            records.extend(json.loads(line) for line in f)
+    return files, records
+
+
+def test_rotation_keeps_every_record(tmp_path):
+    """Records spread over rotated files in order, none lost."""
+    telemetry = Telemetry(tmp_path, max_events=100000, batch_size=64,
+        max_bytes=2000)
+    for number in range(5000):
+        telemetry.emit('shot', x=number)
+    telemetry.close()
+
+    files, records = read_records(tmp_path)
+    assert len(files) > 1
+    assert [record['x'] for record in records] == list(range(5000))
+    assert telemetry.dropped == 0
+
+
+def test_dropped_records_are_counted(tmp_path):
+    """A full queue drops records and the session ends saying how many."""
+    telemetry = Telemetry(tmp_path, max_events=10, batch_size=4)
+    for number in range(20000):
+        telemetry.emit('shot', x=number)
+    telemetry.close()
+
+    _, records = read_records(tmp_path)
+    assert telemetry.dropped > 0
+    assert records[-1]['event'] == 'dropped'
+    assert records[-1]['count'] == telemetry.dropped
+    assert len(records) - 1 + telemetry.dropped == 20000
+
+
+def test_sessions_never_overwrite(tmp_path):
+    """Two sessions started in the same second write separate files."""
+    first, second = Telemetry(tmp_path), Telemetry(tmp_path)
+    first.emit('shot', x=1)
+    second.emit('shot', x=2)
+    first.close()
+    second.close()
+
+    files, records = read_records(tmp_path)
+    assert len(files) == 2
+    assert sorted(record['x'] for record in records) == [1, 2]
@@ -0,0 +1,85 @@
+import numpy as np
+import pygame
+import pytest
+
+from alien_invasion import AlienInvasion
+from fleet import rect_coords
+from pilot import Pilot
+from settings import Settings
+from vector_env import FIRE, LEFT, NOOP, RIGHT, VectorEnv
+
+
+def rule_settings(pixel_collisions, respawn_pause, level_pause):
+    """Return settings with the given collisions and pauses."""
+    settings = Settings()
+    settings.pixel_collisions = pixel_collisions
+    settings.respawn_pause = respawn_pause
+    settings.level_pause = level_pause
+    return settings
+
+
+@pytest.mark.parametrize(
+    'pixel_collisions, seed, fire_rate, respawn_pause, level_pause',
+    [(True, 0, 0.5, 0.5, 0.0), (False, 1, 1.0, 0.0, 0.3)])
+def test_matches_game(pixel_collisions, seed, fire_rate, respawn_pause,
+        level_pause):
+    """One environment plays tick for tick like the game, to game over."""
+    rules = (pixel_collisions, respawn_pause, level_pause)
+    ai = AlienInvasion(headless=True, settings=rule_settings(*rules))
+    ai._start_game()
+    env = VectorEnv(1, rule_settings(*rules))
+    pilot = Pilot(ai, seed, fire_rate)
+    fleet = ai.aliens
+    for _ in range(200000):
+        events = pilot.events()
+        fire = any(event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE
+            for event in events)
+        for event in events:
+            ai._handle_event(event)
+        move = (RIGHT if ai.ship.moving_right else
+            LEFT if ai.ship.moving_left else NOOP)
+        ai.step()
+        _, _, done = env.step([move + FIRE * fire])
+        if done[0]:
+            assert not ai.stats.game_active
+            assert env.final_score[0] == ai.stats.score
+            return
+
+        assert env.score[0] == ai.stats.score
+        assert env.level[0] == ai.stats.level
+        assert env.ships_left[0] == ai.stats.ships_left
+        assert env.ship_x[0] == ai.ship.x
+        assert (env.alive[0] == fleet.alive.reshape(env.rows, env.columns)).all()
+        assert np.array_equal(env.alien_x[0], fleet.x[:env.columns])
+        assert env.fleet_y[0] == fleet.y[0]
+        live = env.bullet_live[0]
+        assert sorted(zip(env.bullet_x[0][live].tolist(),
+            rect_coords(env.bullet_y[0][live]).tolist())) == sorted(
+            (bullet.rect.x, bullet.rect.y) for bullet in ai.bullets)
+    pytest.fail("the game didn't end")
+
+
+def test_games_are_independent():
+    """A batch of games steps exactly like the same games one at a time."""
+    rng = np.random.default_rng(1)
+    actions = rng.integers(0, 6, (5000, 4))
+    batch = VectorEnv(4)
+    singles = [VectorEnv(1) for _ in range(4)]
+    for step in actions:
+        observations, rewards, dones = batch.step(step)
+        for index, single in enumerate(singles):
+            observation, reward, done = single.step(step[index:index + 1])
+            assert (observation[0] == observations[index]).all()
+            assert reward[0] == rewards[index]
+            assert done[0] == dones[index]
+
+
+def test_settings_left_alone():
+    """Resetting games doesn't reset the speeds of the settings passed in."""
+    settings = Settings()
+    settings.increase_speed()
+    ship_speed = settings.ship_speed
+    env = VectorEnv(2, settings)
+    env.reset()
+    assert settings.ship_speed == ship_speed
+    assert env.ship_speed[0] == Settings().ship_speed
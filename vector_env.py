@@ -0,0 +1,372 @@
+import copy
+
+import numpy as np
+import pygame
+
+from fleet import rect_coords
+from settings import Settings
+
+# Actions: what the ship does this step, with or without firing.
+NOOP, LEFT, RIGHT, FIRE, LEFT_FIRE, RIGHT_FIRE = range(6)
+
+
+class VectorEnv:
+    """A class to play many games at once, in lockstep, for training bots.
+
+    The rules of AlienInvasion's ship, bullets, fleet, collisions, ship
+    hits, level ups and pauses are applied to all games together as NumPy
+    array operations, with no sprites and no rendering. Each step is one
+    simulation tick of every game. Collisions follow
+    Settings.pixel_collisions like the game's, and assume, as the default
+    sizes do, that a bullet is narrower and shorter than the gaps between
+    aliens.
+
+    step() takes one action per game (NOOP to RIGHT_FIRE) and returns the
+    observations, rewards (points scored that tick) and done flags. A game
+    that ends is reset straight away; its final score is kept in
+    final_score. frames() draws small grayscale frames of every game.
+    """
+
+    def __init__(self, num_envs, settings=None, size=None):
+        """Initialize num_envs games of size (width, height) and reset them."""
+        self.num_envs = num_envs # games played in lockstep
+        self.settings = settings or Settings() # rules shared by every game
+        settings = self.settings
+        # Starting speeds and points, without resetting the caller's settings.
+        self.initial = copy.copy(settings)
+        self.initial.initialize_dynamic_settings()
+        self.width, self.height = size or (settings.screen_width,
+            settings.screen_height) # world size
+
+        # Only the image sizes, and for pixel collisions the masks, are needed.
+        ship_image = pygame.image.load('images/ship.bmp')
+        alien_image = pygame.image.load('images/alien.bmp')
+        self.ship_width, self.ship_height = ship_image.get_size()
+        self.alien_width, self.alien_height = alien_image.get_size()
+
+        # Whether the solid pixels of an alien and a bullet or the ship
+        # overlap depends only on their offset, so it is looked up in a
+        # table of every offset at which their rects overlap.
+        self.bullet_overlap = self.ship_overlap = None # rects are enough
+        if settings.pixel_collisions:
+            alien_mask = pygame.mask.from_surface(alien_image)
+            self.bullet_overlap = overlap_table(alien_mask, pygame.Mask(
+                (settings.bullet_width, settings.bullet_height), fill=True))
+            self.ship_overlap = overlap_table(alien_mask,
+                pygame.mask.from_surface(ship_image))
+
+        # The formation _create_fleet builds for this world size.
+        w, h = self.alien_width, self.alien_height
+        self.columns = (self.width - 2 * w) // (2 * w) # aliens in a row
+        self.rows = (self.height - 3 * h - self.ship_height) // (2 * h)
+        self.ship_top = self.height - self.ship_height # ship's rect.top
+
+        n, b = num_envs, settings.bullets_allowed
+        self.tick = 1 / settings.tick_rate # game time each step stands for
+        # Per game state, one entry per game.
+        self.ship_x = np.zeros(n) # exact ship position
+        self.alien_x = np.zeros((n, self.columns)) # exact x of each column
+        self.fleet_y = np.zeros(n, dtype=np.int64) # top of the formation
+        self.alive = np.zeros((n, self.rows, self.columns), dtype=bool)
+        self.direction = np.ones(n, dtype=np.int64) # fleet_direction
+        self.ship_speed = np.zeros(n) # dynamic settings of each game
+        self.bullet_speed = np.zeros(n)
+        self.alien_speed = np.zeros(n)
+        self.alien_points = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64) # statistics of each game
+        self.level = np.zeros(n, dtype=np.int64)
+        self.ships_left = np.zeros(n, dtype=np.int64)
+        self.pause = np.zeros(n) # seconds left of a respawn or level pause
+        # Bullets: a fixed slot for each bullet allowed, and its firing order.
+        self.bullet_x = np.zeros((n, b), dtype=np.int64) # rect.x
+        self.bullet_y = np.zeros((n, b)) # exact y
+        self.bullet_live = np.zeros((n, b), dtype=bool)
+        self.bullet_order = np.zeros((n, b), dtype=np.int64) # when fired
+        self.shots = 0 # bullets fired so far, to order them
+        self.final_score = np.zeros(n, dtype=np.int64) # last finished game
+
+        self.reset()
+
+    @property
+    def observation_size(self):
+        """Length of each game's observation vector."""
+        return 6 + 3 * self.settings.bullets_allowed + self.rows * self.columns
+
+    def reset(self, envs=None):
+        """Start new games in envs (all by default) and return observations."""
+        if envs is None:
+            envs = np.ones(self.num_envs, dtype=bool)
+        settings = self.initial # starting speeds and points
+        self.ship_speed[envs] = settings.ship_speed
+        self.bullet_speed[envs] = settings.bullet_speed
+        self.alien_speed[envs] = settings.alien_speed
+        self.alien_points[envs] = settings.alien_points
+        self.direction[envs] = settings.fleet_direction
+        self.score[envs] = 0 # as reset_stats
+        self.level[envs] = 1
+        self.ships_left[envs] = settings.ship_limit
+        self.pause[envs] = 0.0
+        self._new_fleet(envs)
+        self._center_ship(envs)
+        self.bullet_live[envs] = False
+        return self.observations()
+
+    def step(self, actions):
+        """Play one tick of every game; return observations, rewards, dones."""
+        actions = np.asarray(actions)
+        settings = self.settings
+        reward = np.zeros(self.num_envs, dtype=np.int64)
+
+        # Timed pauses run out first, as in GameState.update.
+        pausing = self.pause > 0
+        self.pause[pausing] -= self.tick
+        playing = ~pausing | (self.pause <= 0)
+        self.pause[playing] = 0.0
+
+        # Fire: the space key is handled before the tick, even when paused.
+        fire = actions >= FIRE
+        free = ~self.bullet_live # unused bullet slots
+        fire &= free.any(axis=1)
+        if fire.any():
+            envs = np.flatnonzero(fire)
+            slots = free[envs].argmax(axis=1) # first free slot
+            ship_rect_x = rect_coords(self.ship_x[envs])
+            # rect.midtop = ship.rect.midtop
+            self.bullet_x[envs, slots] = (ship_rect_x + self.ship_width // 2
+                - settings.bullet_width // 2)
+            self.bullet_y[envs, slots] = self.ship_top
+            self.bullet_live[envs, slots] = True
+            self.bullet_order[envs, slots] = self.shots + np.arange(len(envs))
+            self.shots += len(envs)
+
+        # Ship.update
+        move = actions % 3 # NOOP, LEFT or RIGHT
+        ship_rect_x = rect_coords(self.ship_x)
+        right = playing & (move == RIGHT) & (
+            ship_rect_x + self.ship_width < self.width)
+        left = playing & (move == LEFT) & (ship_rect_x > 0)
+        self.ship_x += np.where(right, self.ship_speed, 0.0)
+        self.ship_x -= np.where(left, self.ship_speed, 0.0)
+
+        # _update_bullets: move, then drop bullets off the top of the screen.
+        moving = self.bullet_live & playing[:, None]
+        self.bullet_y -= np.where(moving, self.bullet_speed[:, None], 0.0)
+        bullet_rect_y = rect_coords(self.bullet_y)
+        self.bullet_live &= bullet_rect_y + settings.bullet_height > 0
+        reward += self._collide_bullets(bullet_rect_y, playing)
+
+        # Cleared fleets: increase_speed and start the next level.
+        cleared = playing & ~self.alive.any(axis=(1, 2))
+        if cleared.any():
+            self.bullet_live[cleared] = False
+            self._new_fleet(cleared)
+            self.ship_speed[cleared] *= settings.speedup_scale
+            self.bullet_speed[cleared] *= settings.speedup_scale
+            self.alien_speed[cleared] *= settings.speedup_scale
+            self.alien_points[cleared] = (self.alien_points[cleared]
+                * settings.score_scale).astype(np.int64)
+            self.level[cleared] += 1
+            self.pause[cleared] = settings.level_pause
+
+        # _update_aliens: edges, move, then the ship and the bottom.
+        first, last = self._outer_columns()
+        alien_rect_x = rect_coords(self.alien_x)
+        envs = np.arange(self.num_envs)
+        edge = playing & (
+            (alien_rect_x[envs, last] + self.alien_width >= self.width) |
+            (alien_rect_x[envs, first] <= 0))
+        self.fleet_y += np.where(edge, settings.fleet_drop_speed, 0)
+        self.direction[edge] *= -1
+        self.alien_x += np.where(playing,
+            self.alien_speed * self.direction, 0.0)[:, None]
+        hit = playing & (self._ship_collides() | self._at_bottom())
+        done = self._ship_hit(hit)
+
+        self.final_score[done] = self.score[done]
+        if done.any():
+            self.reset(done)
+        return self.observations(), reward, done
+
+    def observations(self):
+        """Return a float32 observation vector for every game.
+
+        Each is the ship x, fleet x and y, fleet direction, level and ships
+        left; then x, y and in-flight for every bullet slot; then whether
+        each alien of the formation is alive, row by row. Positions are
+        fractions of the world size.
+        """
+        n = self.num_envs
+        return np.concatenate([
+            (self.ship_x / self.width)[:, None],
+            (self.alien_x[:, 0] / self.width)[:, None],
+            (self.fleet_y / self.height)[:, None],
+            self.direction[:, None],
+            self.level[:, None],
+            self.ships_left[:, None],
+            self.bullet_x / self.width,
+            self.bullet_y / self.height,
+            self.bullet_live,
+            self.alive.reshape(n, -1),
+        ], axis=1, dtype=np.float32)
+
+    def frames(self, scale=8):
+        """Return uint8 grayscale frames of every game, scale times smaller.
+
+        Each pixel samples the center of its scale x scale block: aliens
+        are 255, bullets 192 and the ship 128.
+        """
+        # Centers of the sampled pixels.
+        xs = np.arange(self.width // scale) * scale + scale // 2
+        ys = np.arange(self.height // scale) * scale + scale // 2
+        w, h = self.alien_width, self.alien_height
+
+        # Aliens: which formation column and row each pixel falls in.
+        rel_x = xs[None, :] - rect_coords(self.alien_x[:, 0])[:, None]
+        rel_y = ys[None, :] - self.fleet_y[:, None]
+        column, in_x = rel_x // (2 * w), (rel_x % (2 * w) < w)
+        row, in_y = rel_y // (2 * h), (rel_y % (2 * h) < h)
+        in_x &= (column >= 0) & (column < self.columns)
+        in_y &= (row >= 0) & (row < self.rows)
+        envs = np.arange(self.num_envs)[:, None, None]
+        alien = self.alive[envs, row.clip(0, self.rows - 1)[:, :, None],
+            column.clip(0, self.columns - 1)[:, None, :]]
+        alien &= in_y[:, :, None] & in_x[:, None, :]
+
+        frames = np.where(alien, 255, 0).astype(np.uint8)
+        # The ship along the bottom.
+        ship_x = rect_coords(self.ship_x)[:, None]
+        in_ship = (xs >= ship_x) & (xs < ship_x + self.ship_width)
+        frames[:, ys >= self.ship_top, :] |= np.where(
+            in_ship, 128, 0).astype(np.uint8)[:, None, :]
+        # Bullets, a slot at a time.
+        bullet_y = rect_coords(self.bullet_y)
+        for slot in range(self.settings.bullets_allowed):
+            x = self.bullet_x[:, slot, None]
+            y = bullet_y[:, slot, None]
+            in_x = (xs >= x) & (xs < x + self.settings.bullet_width)
+            in_y = (ys >= y) & (ys < y + self.settings.bullet_height)
+            covered = (in_y[:, :, None] & in_x[:, None, :] &
+                self.bullet_live[:, slot, None, None])
+            frames[covered] = 192
+        return frames
+
+    def _collide_bullets(self, bullet_rect_y, playing):
+        """Kill aliens hit by bullets, and return the points scored."""
+        w, h = self.alien_width, self.alien_height
+        settings = self.settings
+        # The column each bullet overlaps, if any: bullets are narrower
+        # than the gaps between aliens, so there is at most one.
+        left = rect_coords(self.alien_x)[:, None, :] # rect.x of each column
+        bullet_x = self.bullet_x[:, :, None]
+        in_x = (left < bullet_x + settings.bullet_width) & (left + w > bullet_x)
+        column = in_x.argmax(axis=2)
+        # The only row each bullet can overlap.
+        rel_y = bullet_rect_y - self.fleet_y[:, None]
+        row = (rel_y + settings.bullet_height - 1) // (2 * h)
+        hits = (self.bullet_live & playing[:, None] & in_x.any(axis=2) &
+            (row >= 0) & (row < self.rows) &
+            (2 * h * row < rel_y + settings.bullet_height) &
+            (2 * h * row + h > rel_y))
+        if not hits.any():
+            return 0
+        envs, slots = np.nonzero(hits)
+        column, row = column[envs, slots], row[envs, slots]
+        living = self.alive[envs, row, column]
+        envs, slots = envs[living], slots[living]
+        column, row = column[living], row[living]
+        if self.bullet_overlap is not None: # only solid pixels collide
+            dx = self.bullet_x[envs, slots] - left[envs, 0, column]
+            dy = bullet_rect_y[envs, slots] - self.fleet_y[envs] - 2 * h * row
+            solid = self.bullet_overlap[dx + settings.bullet_width - 1,
+                dy + settings.bullet_height - 1]
+            envs, slots = envs[solid], slots[solid]
+            column, row = column[solid], row[solid]
+        # An alien hit by several bullets is killed by the first fired.
+        order = np.lexsort((self.bullet_order[envs, slots], column, row, envs))
+        envs, slots = envs[order], slots[order]
+        row, column = row[order], column[order]
+        first = np.ones(len(envs), dtype=bool)
+        first[1:] = ((envs[1:] != envs[:-1]) | (row[1:] != row[:-1]) |
+            (column[1:] != column[:-1]))
+        envs, slots = envs[first], slots[first]
+        row, column = row[first], column[first]
+
+        self.alive[envs, row, column] = False
+        self.bullet_live[envs, slots] = False
+        points = np.bincount(envs, minlength=self.num_envs) * self.alien_points
+        self.score += points
+        return points
+
+    def _outer_columns(self):
+        """Return the first and last formation columns with living aliens."""
+        columns = self.alive.any(axis=1) # living columns of each game
+        first = columns.argmax(axis=1)
+        last = self.columns - 1 - columns[:, ::-1].argmax(axis=1)
+        return first, last
+
+    def _ship_collides(self):
+        """Return which ships overlap a living alien."""
+        w, h = self.alien_width, self.alien_height
+        ship_x = rect_coords(self.ship_x)[:, None]
+        left = rect_coords(self.alien_x) # rect.x of each column
+        top = self.fleet_y[:, None] + 2 * h * np.arange(self.rows)
+        in_x = (left < ship_x + self.ship_width) & (left + w > ship_x)
+        in_y = (top < self.ship_top + self.ship_height) & (top + h > self.ship_top)
+        hits = self.alive & in_y[:, :, None] & in_x[:, None, :]
+        if self.ship_overlap is not None: # only solid pixels collide
+            # Offsets of the ship from each alien, clipped to the table
+            # where the rects don't overlap anyway.
+            table_x, table_y = self.ship_overlap.shape
+            dx = (ship_x - left + self.ship_width - 1).clip(0, table_x - 1)
+            dy = (self.ship_top - top + self.ship_height - 1).clip(0, table_y - 1)
+            hits &= self.ship_overlap[dx[:, None, :], dy[:, :, None]]
+        return hits.any(axis=(1, 2))
+
+    def _at_bottom(self):
+        """Return which fleets have reached the bottom of the screen."""
+        rows = self.alive.any(axis=2) # rows with living aliens
+        last = self.rows - 1 - rows[:, ::-1].argmax(axis=1) # lowest of them
+        bottom = self.fleet_y + 2 * self.alien_height * last + self.alien_height
+        return rows.any(axis=1) & (bottom >= self.height)
+
+    def _ship_hit(self, hit):
+        """Respond to ships being hit, and return which games are over."""
+        over = hit & (self.ships_left == 0)
+        respawn = hit & ~over
+        if respawn.any():
+            self.ships_left[respawn] -= 1
+            self.bullet_live[respawn] = False
+            self._new_fleet(respawn)
+            self._center_ship(respawn)
+            self.pause[respawn] = self.settings.respawn_pause
+        return over
+
+    def _new_fleet(self, envs):
+        """Give envs the formation _create_fleet builds."""
+        # Every column moves by itself, like the aliens in Fleet.x.
+        self.alien_x[envs] = (self.alien_width +
+            2 * self.alien_width * np.arange(self.columns))
+        self.fleet_y[envs] = self.alien_height
+        self.alive[envs] = True
+
+    def _center_ship(self, envs):
+        """Put the ships of envs at the bottom center."""
+        self.ship_x[envs] = self.width // 2 - self.ship_width // 2
+
+
+def overlap_table(mask, other):
+    """Return where other overlaps a solid pixel of mask, by offset.
+
+    Entry [dx + width - 1, dy + height - 1], with other's width and height,
+    is whether other at offset (dx, dy) from mask overlaps it, for every
+    offset at which their rects overlap.
+    """
+    width, height = other.get_size()
+    mask_width, mask_height = mask.get_size()
+    table = np.zeros((mask_width + width - 1, mask_height + height - 1),
+        dtype=bool)
+    for dx in range(1 - width, mask_width):
+        for dy in range(1 - height, mask_height):
+            table[dx + width - 1, dy + height - 1] = (
+                mask.overlap(other, (dx, dy)) is not None)
+    return table